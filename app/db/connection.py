@@ -1,22 +1,114 @@
 """Database connection and management."""
 
+import os
 import sqlite3
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, List, Tuple, Any
+from typing import Optional, List, Tuple, Any, Iterator, Set, Dict
+
+
+# Database directories already known to exist in this process
+_ensured_dirs: Set[Path] = set()
+_ensured_dirs_lock = threading.Lock()
+
+# Per-file counters bumped when a database file is replaced on disk
+_file_generations: Dict[str, int] = {}
+_file_generations_lock = threading.Lock()
+
+
+def _generation_key(db_path) -> str:
+    """Normalize a database path for the generation table."""
+    return os.path.realpath(db_path)
+
+
+def bump_generation(db_path):
+    """
+    Mark a database file as replaced outside any open connection.
+    
+    Called after the file is overwritten (e.g. restoring a backup) so
+    every connection's cache_key changes and memoized reads are dropped.
+    
+    Args:
+        db_path: Path to the database file
+    """
+    key = _generation_key(db_path)
+    with _file_generations_lock:
+        _file_generations[key] = _file_generations.get(key, 0) + 1
+
+
+def _ensure_dir(directory: Path):
+    """Create a directory once per process, skipping the syscalls afterwards."""
+    with _ensured_dirs_lock:
+        if directory in _ensured_dirs:
+            return
+        if not os.path.isdir(directory):
+            directory.mkdir(parents=True, exist_ok=True)
+        _ensured_dirs.add(directory)
+
+
+@dataclass
+class PragmaConfig:
+    """
+    SQLite PRAGMA settings applied to every new connection.
+    
+    WAL journaling with synchronous=NORMAL avoids a full fsync on every
+    commit; a crash may lose the last few commits but never corrupts the
+    database, which is acceptable since backups exist.
+    """
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    temp_store: str = "MEMORY"
+    cache_size: int = -20000  # Negative value is in KiB (~20 MB)
+    mmap_size: int = 268435456  # 256 MB
+    busy_timeout: int = 5000  # Milliseconds
+    foreign_keys: bool = True
+    
+    def statements(self, read_only: bool = False) -> List[str]:
+        """
+        Return the PRAGMA statements for this configuration.
+        
+        Args:
+            read_only: Leave out journal_mode, which a read-only
+                connection cannot change
+        """
+        statements = [] if read_only else [f"PRAGMA journal_mode = {self.journal_mode}"]
+        return statements + [
+            f"PRAGMA synchronous = {self.synchronous}",
+            f"PRAGMA temp_store = {self.temp_store}",
+            f"PRAGMA cache_size = {int(self.cache_size)}",
+            f"PRAGMA mmap_size = {int(self.mmap_size)}",
+            f"PRAGMA busy_timeout = {int(self.busy_timeout)}",
+            f"PRAGMA foreign_keys = {'ON' if self.foreign_keys else 'OFF'}",
+        ]
 
 
 class DatabaseConnection:
     """Manages SQLite database connection and basic operations."""
     
-    def __init__(self, db_path: Path):
+    # Number of compiled statements kept by sqlite3's per-connection LRU cache
+    STATEMENT_CACHE_SIZE = 256
+    
+    # Rows pulled from SQLite per fetchmany() call when streaming results
+    ITER_ARRAYSIZE = 256
+    
+    def __init__(self, db_path: Path, pragmas: Optional[PragmaConfig] = None, read_only: bool = False):
         """
         Initialize database connection.
         
         Args:
             db_path: Path to the SQLite database file
+            pragmas: PRAGMA settings applied on connect (defaults to PragmaConfig())
+            read_only: Open the existing database file read-only, e.g. for a
+                connection private to a background reader thread
         """
         self.db_path = db_path
+        self.pragmas = pragmas if pragmas is not None else PragmaConfig()
+        self.read_only = read_only
         self._connection: Optional[sqlite3.Connection] = None
+        self._in_transaction = False
+        self._generation_key = _generation_key(db_path)
     
     def connect(self) -> sqlite3.Connection:
         """
@@ -26,24 +118,55 @@ class DatabaseConnection:
             sqlite3.Connection object
         """
         if self._connection is None:
-            # Ensure database directory exists
-            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            if self.read_only:
+                # mode=ro never creates the file and rejects writes
+                database = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+            else:
+                # Ensure database directory exists
+                _ensure_dir(self.db_path.parent)
+                database = str(self.db_path)
             
-            # Create connection with row factory for dict-like access
-            self._connection = sqlite3.connect(str(self.db_path))
+            # Create connection with row factory for dict-like access.
+            # Repeated queries reuse compiled statements from the cache.
+            # isolation_level=None disables the sqlite3 module's implicit
+            # BEGIN: single statements autocommit and multi-statement
+            # writes use explicit BEGIN IMMEDIATE via transaction().
+            self._connection = sqlite3.connect(
+                database,
+                isolation_level=None,
+                cached_statements=self.STATEMENT_CACHE_SIZE,
+                check_same_thread=False,
+                uri=self.read_only
+            )
             self._connection.row_factory = sqlite3.Row
             
-            # Enable foreign keys
-            self._connection.execute("PRAGMA foreign_keys = ON")
+            # Apply journal, cache and foreign key settings
+            for pragma in self.pragmas.statements(read_only=self.read_only):
+                self._connection.execute(pragma)
         
         return self._connection
     
     def close(self):
-        """Close database connection."""
+        """Close database connection, refreshing planner statistics first."""
         if self._connection is not None:
+            self.optimize()
             self._connection.close()
             self._connection = None
     
+    def optimize(self):
+        """
+        Run PRAGMA optimize to refresh query planner statistics.
+        
+        Only called at startup and shutdown, since re-planning mid-session
+        invalidates cached statements.
+        """
+        if self._connection is None:
+            return
+        try:
+            self._connection.execute("PRAGMA optimize")
+        except sqlite3.Error:
+            pass
+    
     def execute(self, query: str, params: Tuple[Any, ...] = ()) -> sqlite3.Cursor:
         """
         Execute a database query.
@@ -86,51 +209,183 @@ class DatabaseConnection:
         cursor = self.execute(query, params)
         return cursor.fetchall()
     
-    def insert(self, query: str, params: Tuple[Any, ...] = ()) -> int:
+    def fetch_all_tuples(self, query: str, params: Tuple[Any, ...] = ()) -> List[Tuple[Any, ...]]:
+        """
+        Fetch all rows as plain tuples.
+        
+        Skips sqlite3.Row construction for bulk scans that only need
+        positional access.
+        
+        Args:
+            query: SQL query string
+            params: Query parameters
+        
+        Returns:
+            List of rows as tuples
+        """
+        cursor = self.connect().cursor()
+        cursor.row_factory = None
+        return cursor.execute(query, params).fetchall()
+    
+    def iter_tuples(self, query: str, params: Tuple[Any, ...] = ()) -> Iterator[Tuple[Any, ...]]:
+        """
+        Stream rows as plain tuples without materializing the full result.
+        
+        Rows are pulled from SQLite in batches of ITER_ARRAYSIZE.
+        
+        Args:
+            query: SQL query string
+            params: Query parameters
+        
+        Yields:
+            Rows as tuples
+        """
+        cursor = self.connect().cursor()
+        cursor.row_factory = None
+        cursor.arraysize = self.ITER_ARRAYSIZE
+        try:
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany()
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cursor.close()
+    
+    def insert(self, query: str, params: Tuple[Any, ...] = (), autocommit: bool = True) -> int:
         """
         Insert a row and return the last inserted row ID.
         
         Args:
             query: INSERT query string
             params: Query parameters
+            autocommit: Commit immediately (ignored inside transaction())
         
         Returns:
             Last inserted row ID
         """
+        self._begin_unless_autocommit(autocommit)
         cursor = self.execute(query, params)
-        self.commit()
+        self._autocommit(autocommit)
         return cursor.lastrowid
     
-    def update(self, query: str, params: Tuple[Any, ...] = ()) -> int:
+    def insert_many(self, query: str, seq_of_params: List[Tuple[Any, ...]]) -> int:
+        """
+        Insert multiple rows with a single prepared statement and commit once.
+        
+        Args:
+            query: INSERT query string
+            seq_of_params: Sequence of parameter tuples, one per row
+        
+        Returns:
+            Number of rows inserted
+        """
+        with self.transaction():
+            cursor = self.connect().executemany(query, seq_of_params)
+        return cursor.rowcount
+    
+    def update(self, query: str, params: Tuple[Any, ...] = (), autocommit: bool = True) -> int:
         """
         Update rows in database.
         
         Args:
             query: UPDATE query string
             params: Query parameters
+            autocommit: Commit immediately (ignored inside transaction())
         
         Returns:
             Number of rows affected
         """
+        self._begin_unless_autocommit(autocommit)
         cursor = self.execute(query, params)
-        self.commit()
+        self._autocommit(autocommit)
+        return cursor.rowcount
+    
+    def update_many(self, query: str, seq_of_params: List[Tuple[Any, ...]]) -> int:
+        """
+        Run an UPDATE once per parameter tuple as one prepared statement
+        and commit once.
+        
+        Args:
+            query: UPDATE query string
+            seq_of_params: Sequence of parameter tuples, one per execution
+        
+        Returns:
+            Total number of rows affected
+        """
+        with self.transaction():
+            cursor = self.connect().executemany(query, seq_of_params)
         return cursor.rowcount
     
-    def delete(self, query: str, params: Tuple[Any, ...] = ()) -> int:
+    def delete(self, query: str, params: Tuple[Any, ...] = (), autocommit: bool = True) -> int:
         """
         Delete rows from database.
         
         Args:
             query: DELETE query string
             params: Query parameters
+            autocommit: Commit immediately (ignored inside transaction())
         
         Returns:
             Number of rows deleted
         """
+        self._begin_unless_autocommit(autocommit)
         cursor = self.execute(query, params)
-        self.commit()
+        self._autocommit(autocommit)
         return cursor.rowcount
     
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Group several writes into one transaction with a single commit.
+        
+        Issues BEGIN IMMEDIATE, commits on success and rolls back on error.
+        insert/update/delete skip their own commit inside the block.
+        Nested calls join the outer transaction, as do calls made while a
+        transaction opened by autocommit=False writes is pending: that one
+        is left for its owner to commit or roll back.
+        
+        Yields:
+            sqlite3.Connection object
+        """
+        conn = self.connect()
+        if self._in_transaction:
+            yield conn
+            return
+        
+        if conn.in_transaction:
+            self._in_transaction = True
+            try:
+                yield conn
+            finally:
+                self._in_transaction = False
+            return
+        
+        conn.execute("BEGIN IMMEDIATE")
+        self._in_transaction = True
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        else:
+            conn.commit()
+        finally:
+            self._in_transaction = False
+    
+    def _begin_unless_autocommit(self, autocommit: bool):
+        """Open a write transaction for callers that will commit themselves."""
+        if not autocommit and not self._in_transaction:
+            conn = self.connect()
+            if not conn.in_transaction:
+                conn.execute("BEGIN IMMEDIATE")
+    
+    def _autocommit(self, autocommit: bool):
+        """Commit unless disabled or running inside transaction()."""
+        if autocommit and not self._in_transaction:
+            self.commit()
+    
     def commit(self):
         """Commit current transaction."""
         conn = self.connect()
@@ -141,6 +396,58 @@ class DatabaseConnection:
         conn = self.connect()
         conn.rollback()
     
+    @property
+    def change_count(self) -> int:
+        """
+        Total rows inserted, updated or deleted through this connection.
+        
+        Writes made through other connections are not counted; use
+        cache_key to invalidate read caches.
+        """
+        return self.connect().total_changes
+    
+    @property
+    def cache_key(self) -> Tuple[int, int, int]:
+        """
+        Key that changes whenever the database contents may have changed.
+        
+        Combines this connection's change count, PRAGMA data_version
+        (which moves when another connection or process commits) and the
+        file generation bumped by bump_generation() when the file is
+        replaced, e.g. by restoring a backup.
+        
+        Returns:
+            Tuple usable as a memoization key for read caches
+        """
+        conn = self.connect()
+        data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+        return (
+            conn.total_changes,
+            data_version,
+            _file_generations.get(self._generation_key, 0),
+        )
+    
+    def get_user_version(self) -> int:
+        """
+        Get the schema version stored in the database header.
+        
+        Returns:
+            Value of PRAGMA user_version (0 for a new database)
+        """
+        row = self.fetch_one("PRAGMA user_version")
+        return row[0] if row else 0
+    
+    def set_user_version(self, version: int):
+        """
+        Store the schema version in the database header.
+        
+        Args:
+            version: Schema version number
+        """
+        conn = self.connect()
+        conn.execute(f"PRAGMA user_version = {int(version)}")
+        conn.commit()
+    
     def execute_script(self, script: str):
         """
         Execute a SQL script (useful for schema creation).
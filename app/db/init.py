@@ -1,9 +1,43 @@
 """Database initialization and setup."""
 
+import atexit
+import functools
+import threading
 from pathlib import Path
+from typing import Dict
 from app.db.connection import DatabaseConnection
 from app.db.path_manager import DatabasePathManager, DatabaseBackupManager
 from app.db.migration import migrate_database
+from app.db.revenue_cache import REVENUE_CACHE_SCHEMA, rebuild_revenue_cache
+
+
+# Bump whenever schema.sql or the migrations change so existing databases
+# re-run initialization
+SCHEMA_VERSION = 5
+
+# Indexes for the hot session queries, in each query's ORDER BY order so the
+# sort step is skipped. The partial ones cover only the rows their query
+# filters on; the state/date one serves the state-filtered lists and the
+# COMPLETED revenue ranges. Kept out of schema.sql because legacy databases
+# only gain session_state during migration.
+_QUERY_INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_sessions_active
+    ON sessions(login_time DESC) WHERE session_state = 'ACTIVE';
+CREATE INDEX IF NOT EXISTS idx_sessions_pending
+    ON sessions(date DESC, login_time DESC) WHERE payment_status = 'Pending';
+CREATE INDEX IF NOT EXISTS idx_sessions_state_date_login
+    ON sessions(session_state, date DESC, login_time DESC);
+"""
+
+# One long-lived connection per database file (single-writer desktop app)
+_connections: Dict[Path, DatabaseConnection] = {}
+_connections_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1)
+def _load_schema() -> str:
+    """Read schema.sql once per process; warm starts never call this."""
+    return (Path(__file__).parent / "schema.sql").read_text(encoding="utf-8")
 
 
 # Get database path from path manager (uses AppData directory)
@@ -16,6 +50,9 @@ def get_database(db_path: Path = None) -> DatabaseConnection:
     """
     Get or create the database connection.
     
+    Connections are shared per database file so every caller reuses the
+    same warm SQLite connection and page cache.
+    
     Args:
         db_path: Path to the database file (defaults to AppData directory)
     
@@ -24,7 +61,25 @@ def get_database(db_path: Path = None) -> DatabaseConnection:
     """
     if db_path is None:
         db_path = get_default_db_path()
-    return DatabaseConnection(db_path)
+    
+    key = Path(db_path).resolve()
+    with _connections_lock:
+        db = _connections.get(key)
+        if db is None:
+            db = DatabaseConnection(Path(db_path))
+            _connections[key] = db
+        return db
+
+
+def close_all():
+    """Close and forget all shared database connections."""
+    with _connections_lock:
+        for db in _connections.values():
+            db.close()
+        _connections.clear()
+
+
+atexit.register(close_all)
 
 
 def initialize_database(db_path: Path = None) -> DatabaseConnection:
@@ -33,8 +88,9 @@ def initialize_database(db_path: Path = None) -> DatabaseConnection:
     
     This function:
     1. Creates the database file if it doesn't exist
-    2. Executes the schema to create tables if they don't exist
-    3. Inserts default systems if the systems table is empty
+    2. Returns immediately if PRAGMA user_version matches SCHEMA_VERSION
+    3. Otherwise executes the schema, runs migrations and inserts default
+       systems if the systems table is empty, then records SCHEMA_VERSION
     4. Ensures data directory is created in a safe location (outside executable)
     
     Args:
@@ -54,19 +110,31 @@ def initialize_database(db_path: Path = None) -> DatabaseConnection:
         db = get_database(db_path)
         db.connect()
         
-        # Load and execute schema
-        schema_path = Path(__file__).parent / "schema.sql"
-        with open(schema_path, "r") as f:
-            schema = f.read()
+        # Already initialized at the current version: nothing to do
+        if db.get_user_version() >= SCHEMA_VERSION:
+            return db
         
-        db.execute_script(schema)
+        # Load and execute schema
+        db.execute_script(_load_schema())
         
         # Run migration for prepaid-first model if needed
         migrate_database(db_path)
         
+        # Query indexes and the revenue cache triggers need the migrated
+        # columns, so they come last
+        db.execute_script(_QUERY_INDEXES)
+        db.execute_script(REVENUE_CACHE_SCHEMA)
+        rebuild_revenue_cache(db)
+        
         # Insert default systems if the table is empty
         _initialize_default_systems(db)
         
+        # Record the version only once every step has succeeded
+        db.set_user_version(SCHEMA_VERSION)
+        
+        # Give the query planner baseline statistics
+        db.optimize()
+        
         return db
     
     except Exception as e:
@@ -86,22 +154,23 @@ def _initialize_default_systems(db: DatabaseConnection):
     Args:
         db: DatabaseConnection instance
     """
-    # Check if systems table has data
-    result = db.fetch_one("SELECT COUNT(*) as count FROM systems")
+    # Insert default systems with types and rates
+    default_systems = [
+        ("PS-4", "PlayStation", 200.0),
+        ("PS-5", "PlayStation", 250.0),
+        ("XB-01", "Xbox", 200.0),
+        ("XB-02", "Xbox", 200.0),
+        ("PC-01", "PC Gaming", 300.0),
+        ("PC-02", "PC Gaming", 300.0),
+    ]
     
-    if result["count"] == 0:
-        # Insert default systems with types and rates
-        default_systems = [
-            ("PS-4", "PlayStation", 200.0),
-            ("PS-5", "PlayStation", 250.0),
-            ("XB-01", "Xbox", 200.0),
-            ("XB-02", "Xbox", 200.0),
-            ("PC-01", "PC Gaming", 300.0),
-            ("PC-02", "PC Gaming", 300.0),
-        ]
-        
-        for system_name, system_type, hourly_rate in default_systems:
-            db.insert(
-                "INSERT INTO systems (system_name, system_type, default_hourly_rate) VALUES (?, ?, ?)",
-                (system_name, system_type, hourly_rate)
-            )
+    # Single idempotent statement: the emptiness check runs inside SQLite
+    # and UNIQUE(system_name) makes concurrent seeding harmless
+    placeholders = ", ".join("(?, ?, ?)" for _ in default_systems)
+    params = tuple(value for system in default_systems for value in system)
+    db.insert(
+        f"""INSERT OR IGNORE INTO systems (system_name, system_type, default_hourly_rate)
+            SELECT column1, column2, column3 FROM (VALUES {placeholders})
+            WHERE NOT EXISTS (SELECT 1 FROM systems)""",
+        params
+    )
@@ -1,10 +1,29 @@
 """Database migration script for prepaid-first session model."""
 
+import logging
 import sqlite3
+from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
 
+log = logging.getLogger(__name__)
+
+# Legacy values that would violate the rebuilt table's constraints:
+# old payment statuses like 'Paid-Cash' (the method now lives in
+# payment_method) and unfinished sessions without a total
+_LEGACY_VALUE_FIXES = {
+    "payment_status": (
+        "CASE WHEN payment_status LIKE 'Paid%' AND payment_status != 'PAID' "
+        "THEN 'PAID' ELSE payment_status END"
+    ),
+    "total_due": "COALESCE(total_due, paid_amount)",
+}
+
+# Page cache used while rebuilding the sessions table (negative = KiB)
+REBUILD_CACHE_SIZE = -65536
+
+
 def migrate_database(db_path: Path) -> bool:
     """
     Migrate database to prepaid-first session model.
@@ -16,6 +35,7 @@ def migrate_database(db_path: Path) -> bool:
     4. Sets payment_method based on old payment_status
     5. Keeps payment_status as-is (old values) to avoid CHECK constraint issues
     6. Makes system_id nullable to preserve session history when systems are deleted
+       (also applied to databases migrated before this step existed)
     
     Args:
         db_path: Path to the database file
@@ -32,126 +52,119 @@ def migrate_database(db_path: Path) -> bool:
     try:
         # Check if migration already applied
         cursor.execute("PRAGMA table_info(sessions)")
-        columns = [column[1] for column in cursor.fetchall()]
+        table_info = cursor.fetchall()
+        columns = {column[1] for column in table_info}
+        
+        # Check if we need to update the foreign key constraint
+        # This is done by checking if system_id is nullable
+        system_id_col = next((col for col in table_info if col[1] == 'system_id'), None)
+        needs_nullable_system_id = bool(system_id_col and system_id_col[3] == 1)  # notnull flag is 1
         
         if 'session_state' in columns:
-            print("[INFO] Database already migrated")
+            log.info("Database already migrated")
             
-            # Check if we need to update the foreign key constraint
-            # This is done by checking if system_id is nullable
-            cursor.execute("PRAGMA table_info(sessions)")
-            columns = cursor.fetchall()
-            system_id_col = next((col for col in columns if col[1] == 'system_id'), None)
+            if _normalize_login_times(cursor):
+                conn.commit()
             
-            if system_id_col and system_id_col[3] == 1:  # notnull flag is 1
-                print("[INFO] Updating foreign key constraint to allow NULL system_id...")
+            if needs_nullable_system_id:
+                log.info("Updating foreign key constraint to allow NULL system_id...")
                 _update_foreign_key_constraint(conn, cursor)
             
-            conn.close()
             return False
         
-        print("[INFO] Starting database migration for prepaid-first model...")
+        log.info("Starting database migration for prepaid-first model...")
         
         # Add new columns (without CHECK constraints that would conflict)
         migration_steps = [
             # Add session_state column (default COMPLETED for existing sessions)
-            "ALTER TABLE sessions ADD COLUMN session_state TEXT DEFAULT 'COMPLETED'",
+            ("session_state", "TEXT DEFAULT 'COMPLETED'"),
             
             # Add planned_duration_min (use existing duration_minutes)
-            "ALTER TABLE sessions ADD COLUMN planned_duration_min INTEGER",
+            ("planned_duration_min", "INTEGER"),
             
             # Add actual_duration_min (use existing duration_minutes)
-            "ALTER TABLE sessions ADD COLUMN actual_duration_min INTEGER",
+            ("actual_duration_min", "INTEGER"),
             
             # Add paid_amount (use total_due)
-            "ALTER TABLE sessions ADD COLUMN paid_amount REAL",
+            ("paid_amount", "REAL"),
             
             # Add payment_method (extract from payment_status)
-            "ALTER TABLE sessions ADD COLUMN payment_method TEXT",
+            ("payment_method", "TEXT"),
         ]
         
-        for step in migration_steps:
-            try:
-                cursor.execute(step)
-                col_name = step.split('ADD COLUMN')[1].split()[0]
-                print(f"[OK] {col_name}")
-            except sqlite3.OperationalError as e:
-                if "already exists" in str(e):
-                    col_name = step.split('ADD COLUMN')[1].split()[0]
-                    print(f"[SKIP] Column already exists: {col_name}")
-                else:
-                    raise
-        
-        # Update payment_method from old payment_status
-        print("[INFO] Converting payment_status to payment_method...")
-        
-        cursor.execute("SELECT DISTINCT payment_status FROM sessions WHERE payment_status IS NOT NULL")
-        statuses = cursor.fetchall()
-        
-        for status, in statuses:
-            if status is None:
-                continue
-            
-            # Extract payment method from old status (e.g., 'Paid-Cash' -> 'Cash')
-            if 'Cash' in status:
-                method = 'Cash'
-            elif 'Online' in status:
-                method = 'Online'
-            elif 'Mixed' in status:
-                method = 'Mixed'
+        pending_steps = []
+        for col_name, col_def in migration_steps:
+            if col_name in columns:
+                log.info("Column already exists: %s", col_name)
             else:
-                method = 'Cash'  # Default
-            
-            cursor.execute(
-                "UPDATE sessions SET payment_method = ? WHERE payment_status = ?",
-                (method, status)
-            )
-            print(f"[OK] Updated {cursor.rowcount} sessions with payment method: {method}")
+                pending_steps.append(f"ALTER TABLE sessions ADD COLUMN {col_name} {col_def};")
         
-        # Set paid_amount from total_due and ensure it has a value
-        print("[INFO] Setting paid_amount from total_due...")
-        cursor.execute(
-            "UPDATE sessions SET paid_amount = COALESCE(total_due, hourly_rate) WHERE paid_amount IS NULL"
-        )
-        print(f"[OK] Updated {cursor.rowcount} sessions with paid_amount")
+        # Open the migration transaction and add all columns in one script.
+        # The transaction stays open for the data updates below.
+        cursor.executescript("BEGIN IMMEDIATE;\n" + "\n".join(pending_steps))
+        for col_name, _ in migration_steps:
+            if col_name not in columns:
+                log.info("Added column: %s", col_name)
         
-        # Set planned_duration_min from duration_minutes
-        print("[INFO] Setting planned_duration_min from duration_minutes...")
+        # Update payment_method from old payment_status in a single pass
+        # (e.g., 'Paid-Cash' -> 'Cash'; unknown statuses default to Cash)
+        log.info("Converting payment_status to payment_method...")
         cursor.execute(
-            "UPDATE sessions SET planned_duration_min = COALESCE(duration_minutes, 60) WHERE planned_duration_min IS NULL"
+            """UPDATE sessions SET payment_method = CASE
+                   WHEN instr(payment_status, 'Cash') > 0 THEN 'Cash'
+                   WHEN instr(payment_status, 'Online') > 0 THEN 'Online'
+                   WHEN instr(payment_status, 'Mixed') > 0 THEN 'Mixed'
+                   ELSE 'Cash'
+               END
+               WHERE payment_method IS NULL AND payment_status IS NOT NULL"""
         )
-        print(f"[OK] Updated {cursor.rowcount} sessions with planned_duration_min")
+        log.info("Updated %d sessions with payment method", cursor.rowcount)
         
-        # Set actual_duration_min from duration_minutes
-        print("[INFO] Setting actual_duration_min from duration_minutes...")
+        # Fill paid_amount, planned_duration_min and actual_duration_min
+        # from the old total_due / duration_minutes columns in one pass
+        log.info("Setting paid_amount and durations from old columns...")
         cursor.execute(
-            "UPDATE sessions SET actual_duration_min = duration_minutes WHERE actual_duration_min IS NULL"
+            """UPDATE sessions SET
+                   paid_amount = COALESCE(paid_amount, total_due, hourly_rate),
+                   planned_duration_min = COALESCE(planned_duration_min, duration_minutes, 60),
+                   actual_duration_min = COALESCE(actual_duration_min, duration_minutes)
+               WHERE paid_amount IS NULL
+                  OR planned_duration_min IS NULL
+                  OR actual_duration_min IS NULL"""
         )
-        print(f"[OK] Updated {cursor.rowcount} sessions with actual_duration_min")
+        log.info("Updated %d sessions with paid_amount and durations", cursor.rowcount)
         
         # Set session_state to COMPLETED for all existing sessions
-        print("[INFO] Setting session_state to COMPLETED for existing sessions...")
+        log.info("Setting session_state to COMPLETED for existing sessions...")
         cursor.execute(
             "UPDATE sessions SET session_state = 'COMPLETED' WHERE session_state IS NULL OR session_state = 'COMPLETED'"
         )
-        print(f"[OK] Updated {cursor.rowcount} sessions to COMPLETED state")
+        log.info("Updated %d sessions to COMPLETED state", cursor.rowcount)
         
         # Set session_state to PLANNED for any sessions without login_time
         # (these will be unpaid/incomplete sessions)
-        print("[INFO] Setting session_state to PLANNED for unpaid sessions...")
+        log.info("Setting session_state to PLANNED for unpaid sessions...")
         cursor.execute(
             "UPDATE sessions SET session_state = 'PLANNED' WHERE login_time IS NULL AND payment_status = 'Pending'"
         )
-        print(f"[OK] Updated {cursor.rowcount} sessions to PLANNED state")
+        log.info("Updated %d sessions to PLANNED state", cursor.rowcount)
+        
+        _normalize_login_times(cursor)
         
         # Commit changes
         conn.commit()
-        print("[OK] Database migration completed successfully!")
+        log.info("Database migration completed successfully")
+        
+        # Relax system_id in the same run so callers can treat the
+        # database as fully migrated afterwards
+        if needs_nullable_system_id:
+            log.info("Updating foreign key constraint to allow NULL system_id...")
+            _update_foreign_key_constraint(conn, cursor)
         
         return True
     
     except Exception as e:
-        print(f"[ERROR] Migration failed: {str(e)}")
+        log.error("Migration failed: %s", e)
         conn.rollback()
         raise
     
@@ -159,6 +172,40 @@ def migrate_database(db_path: Path) -> bool:
         conn.close()
 
 
+def _normalize_login_times(cursor: sqlite3.Cursor) -> int:
+    """
+    Zero-pad stored login times (e.g. '9:45:00' -> '09:45:00').
+    
+    end_session computes durations in SQL by slicing hours and minutes
+    out of login_time at fixed offsets, which only works on the padded
+    HH:MM:SS form that start_session now stores.
+    
+    Args:
+        cursor: Database cursor
+    
+    Returns:
+        Number of sessions updated
+    """
+    cursor.execute(
+        """SELECT id, login_time FROM sessions
+           WHERE login_time IS NOT NULL
+             AND login_time NOT GLOB '[0-2][0-9]:[0-5][0-9]:[0-5][0-9]'"""
+    )
+    fixes = []
+    for session_id, login_time in cursor.fetchall():
+        try:
+            padded = datetime.strptime(login_time, "%H:%M:%S").strftime("%H:%M:%S")
+        except (TypeError, ValueError):
+            log.warning("Leaving unparseable login_time %r on session %d", login_time, session_id)
+            continue
+        fixes.append((padded, session_id))
+    
+    if fixes:
+        cursor.executemany("UPDATE sessions SET login_time = ? WHERE id = ?", fixes)
+        log.info("Zero-padded login_time on %d sessions", len(fixes))
+    return len(fixes)
+
+
 def check_migration_status(db_path: Path) -> dict:
     """
     Check the migration status of the database.
@@ -205,14 +252,22 @@ def _update_foreign_key_constraint(conn: sqlite3.Connection, cursor: sqlite3.Cur
         conn: Database connection
         cursor: Database cursor
     """
+    # Foreign key enforcement cannot be toggled inside a transaction,
+    # so disable it before the rebuild transaction starts
+    cursor.execute("PRAGMA foreign_keys = OFF")
+    
+    # Use a larger page cache (64 MB) for the bulk copy and index builds
+    cursor.execute("PRAGMA cache_size")
+    previous_cache_size = cursor.fetchone()[0]
+    cursor.execute(f"PRAGMA cache_size = {REBUILD_CACHE_SIZE}")
+    
     try:
-        # Disable foreign keys temporarily
-        cursor.execute("PRAGMA foreign_keys = OFF")
+        cursor.execute("BEGIN IMMEDIATE")
         
         # Rename old table
         cursor.execute("ALTER TABLE sessions RENAME TO sessions_old")
         
-        # Create new table with updated schema
+        # Create new table with updated schema (indices are built after the copy)
         cursor.execute("""
             CREATE TABLE sessions (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -237,28 +292,39 @@ def _update_foreign_key_constraint(conn: sqlite3.Connection, cursor: sqlite3.Cur
             )
         """)
         
-        # Copy data from old table to new table
-        cursor.execute("""
-            INSERT INTO sessions 
-            SELECT * FROM sessions_old
+        # Copy data by column name; columns added out of order by the
+        # prepaid migration (or dropped from the new schema) are handled
+        cursor.execute("PRAGMA table_info(sessions)")
+        new_columns = [column[1] for column in cursor.fetchall()]
+        cursor.execute("PRAGMA table_info(sessions_old)")
+        old_columns = {column[1] for column in cursor.fetchall()}
+        copy_columns = [col for col in new_columns if col in old_columns]
+        column_list = ", ".join(copy_columns)
+        select_list = ", ".join(_LEGACY_VALUE_FIXES.get(col, col) for col in copy_columns)
+        
+        cursor.execute(f"""
+            INSERT INTO sessions ({column_list})
+            SELECT {select_list} FROM sessions_old
         """)
         
         # Drop old table
         cursor.execute("DROP TABLE sessions_old")
         
-        # Re-create indices
+        # Build indices once over the fully populated table
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_sessions_date ON sessions(date)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_sessions_system ON sessions(system_id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_sessions_payment ON sessions(payment_status)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_sessions_customer ON sessions(customer_name)")
         
-        # Re-enable foreign keys
-        cursor.execute("PRAGMA foreign_keys = ON")
-        
         conn.commit()
-        print("[OK] Foreign key constraint updated to allow NULL system_id")
+        log.info("Foreign key constraint updated to allow NULL system_id")
     
     except Exception as e:
         conn.rollback()
-        print(f"[ERROR] Failed to update foreign key constraint: {e}")
-        raise
\ No newline at end of file
+        log.error("Failed to update foreign key constraint: %s", e)
+        raise
+    
+    finally:
+        # Re-enable foreign keys and restore the page cache size
+        cursor.execute("PRAGMA foreign_keys = ON")
+        cursor.execute(f"PRAGMA cache_size = {int(previous_cache_size)}")
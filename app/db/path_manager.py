@@ -1,11 +1,106 @@
 """Database path and persistence management."""
 
+import functools
+import hashlib
 import os
 import shutil
+import sqlite3
+import sys
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, List, Tuple
 
+from app.db.connection import bump_generation
+
+
+# Buffer size for the portable copy fallback
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+def _fastcopy(src: Path, dst: Path):
+    """
+    Copy a file using the fastest mechanism available, preserving metadata.
+    
+    On Linux, os.copy_file_range lets the kernel copy (or reflink) the data
+    without passing it through userspace. Elsewhere, or if the filesystem
+    refuses, fall back to a large-buffer copy.
+    
+    Args:
+        src: Source file path
+        dst: Destination file path
+    """
+    copied = False
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+                while os.copy_file_range(src_fd, dst_fd, COPY_BUFFER_SIZE * 64):
+                    pass
+            copied = True
+        except OSError:
+            copied = False
+    
+    if not copied:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            shutil.copyfileobj(fsrc, fdst, COPY_BUFFER_SIZE)
+    
+    shutil.copystat(src, dst)
+
+
+def _file_sha256(path: Path) -> str:
+    """
+    Compute the SHA-256 hex digest of a file, streaming it in large blocks.
+    
+    Args:
+        path: File to hash
+    
+    Returns:
+        Hex digest string
+    """
+    with open(path, "rb") as f:
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        digest = hashlib.sha256()
+        for block in iter(lambda: f.read(COPY_BUFFER_SIZE), b""):
+            digest.update(block)
+        return digest.hexdigest()
+
+
+def _read_metadata_field(metadata_path, field: str) -> Optional[str]:
+    """
+    Read a single field from a backup metadata file.
+    
+    Args:
+        metadata_path: Path to the .backup.meta file
+        field: Field name, e.g. "description"
+    
+    Returns:
+        Field value, or None if missing or unreadable
+    """
+    try:
+        with open(metadata_path, "r") as f:
+            text = f.read()
+    except (OSError, ValueError):
+        return None
+    
+    _, found, rest = text.partition(f"{field}:")
+    if not found:
+        return None
+    return rest.split("\n", 1)[0].strip()
+
+
+def _read_description(metadata_path) -> Optional[str]:
+    """
+    Read the description field from a backup metadata file.
+    
+    Args:
+        metadata_path: Path to the .backup.meta file
+    
+    Returns:
+        Description text, or None if missing or unreadable
+    """
+    return _read_metadata_field(metadata_path, "description")
+
 
 class DatabasePathManager:
     """Manages database paths and ensures they are outside the executable."""
@@ -16,6 +111,7 @@ class DatabasePathManager:
     BACKUPS_DIRNAME = "backups"
     
     @staticmethod
+    @functools.lru_cache(maxsize=1)
     def get_app_data_dir() -> Path:
         """
         Get the application data directory.
@@ -24,6 +120,9 @@ class DatabasePathManager:
         On macOS: ~/Library/Application Support/GamingCafeManager/data
         On Linux: ~/.local/share/GamingCafeManager/data
         
+        The location is fixed for the lifetime of the process, so the
+        result is cached.
+        
         Returns:
             Path to the application data directory
         """
@@ -37,7 +136,7 @@ class DatabasePathManager:
                 app_dir = Path.home() / "AppData" / "Roaming" / DatabasePathManager.APP_NAME
         elif os.name == 'posix':
             # macOS and Linux
-            if os.uname().sysname == 'Darwin':  # macOS
+            if sys.platform == 'darwin':  # macOS
                 app_dir = Path.home() / "Library" / "Application Support" / DatabasePathManager.APP_NAME
             else:  # Linux
                 app_dir = Path.home() / ".local" / "share" / DatabasePathManager.APP_NAME
@@ -48,11 +147,12 @@ class DatabasePathManager:
         return app_dir
     
     @staticmethod
+    @functools.lru_cache(maxsize=1)
     def get_data_dir() -> Path:
         """
         Get the data directory for the application.
         
-        Creates the directory if it doesn't exist.
+        Creates the directory if it doesn't exist (once per process).
         
         Returns:
             Path to the data directory
@@ -78,11 +178,12 @@ class DatabasePathManager:
         return data_dir / filename
     
     @staticmethod
+    @functools.lru_cache(maxsize=1)
     def get_backups_dir() -> Path:
         """
         Get the backups directory for the application.
         
-        Creates the directory if it doesn't exist.
+        Creates the directory if it doesn't exist (once per process).
         
         Returns:
             Path to the backups directory
@@ -96,6 +197,7 @@ class DatabaseBackupManager:
     """Manages database backups and restoration."""
     
     BACKUP_EXTENSION = ".backup"
+    METADATA_EXTENSION = BACKUP_EXTENSION + ".meta"
     
     def __init__(self, database_path: Path):
         """
@@ -106,13 +208,19 @@ class DatabaseBackupManager:
         """
         self.database_path = database_path
         self.backups_dir = DatabasePathManager.get_backups_dir()
+        self._db_stem = database_path.stem
+        self._db_name = database_path.name
     
     def create_backup(self, description: str = None) -> Optional[Path]:
         """
         Create a backup of the database.
         
         Backup filename format: cafe-YYYYMMDD-HHMMSS.backup
-        with optional description in a metadata file.
+        with its content hash and optional description in a metadata file.
+        If the database is unchanged since the newest backup, that backup's
+        path is returned instead of writing a duplicate copy, unless a
+        different description is given, so every labelled backup keeps
+        its label.
         
         Args:
             description: Optional description of the backup
@@ -128,28 +236,93 @@ class DatabaseBackupManager:
             raise FileNotFoundError(f"Database file not found: {self.database_path}")
         
         try:
-            # Create backup filename with timestamp
-            timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-            db_name = self.database_path.stem
-            backup_filename = f"{db_name}-{timestamp}{self.BACKUP_EXTENSION}"
+            self._checkpoint_database()
+            
+            # Skip the copy when the database is unchanged since the newest
+            # backup (its content hash is recorded in the metadata file) and
+            # the caller isn't attaching a new description to it
+            digest = _file_sha256(self.database_path)
+            latest = self._latest_backup()
+            if latest is not None:
+                latest_metadata = latest.with_suffix(self.METADATA_EXTENSION)
+                if _read_metadata_field(latest_metadata, "sha256") == digest and (
+                    not description or _read_description(latest_metadata) == description.strip()
+                ):
+                    return latest
+            
+            # Create backup filename with timestamp (one clock read for
+            # both the filename and the metadata)
+            now = datetime.now()
+            timestamp = now.strftime("%Y%m%d-%H%M%S")
+            backup_filename = f"{self._db_stem}-{timestamp}{self.BACKUP_EXTENSION}"
             backup_path = self.backups_dir / backup_filename
             
             # Copy database file to backup location
-            shutil.copy2(self.database_path, backup_path)
+            _fastcopy(self.database_path, backup_path)
             
-            # Write metadata file if description provided
-            if description:
-                metadata_path = backup_path.with_suffix(self.BACKUP_EXTENSION + ".meta")
-                with open(metadata_path, "w") as f:
-                    f.write(f"timestamp: {datetime.now().isoformat()}\n")
-                    f.write(f"description: {description}\n")
-                    f.write(f"database: {self.database_path.name}\n")
+            # Write metadata file; the hash goes before the free-form
+            # description so field lookups never match inside it
+            metadata_path = backup_path.with_suffix(self.METADATA_EXTENSION)
+            with open(metadata_path, "w") as f:
+                f.write(
+                    f"timestamp: {now.isoformat()}\n"
+                    f"sha256: {digest}\n"
+                    + (f"description: {description}\n" if description else "")
+                    + f"database: {self._db_name}\n"
+                )
             
             return backup_path
         
         except Exception as e:
             raise IOError(f"Failed to create backup: {str(e)}") from e
     
+    def _latest_backup(self) -> Optional[Path]:
+        """
+        Find the most recently created backup of this database.
+        
+        Goes by the timestamp in the file name: backups carry the database
+        file's mtime (copystat), which after a restore is older than the
+        backups made before it.
+        
+        Returns:
+            Path to the newest backup, or None if there are no backups
+        """
+        prefix = f"{self._db_stem}-"
+        latest = None
+        latest_stamp = None
+        with os.scandir(self.backups_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if not (name.startswith(prefix) and name.endswith(self.BACKUP_EXTENSION)):
+                    continue
+                # YYYYMMDD-HHMMSS sorts chronologically as a string
+                stamp = name[len(prefix):-len(self.BACKUP_EXTENSION)]
+                if len(stamp) != 15 or not stamp.replace("-", "", 1).isdigit():
+                    continue  # Another database whose stem starts with ours
+                if latest_stamp is None or stamp > latest_stamp:
+                    latest, latest_stamp = entry.path, stamp
+        return Path(latest) if latest is not None else None
+    
+    def _checkpoint_database(self):
+        """
+        Flush the write-ahead log into the main database file.
+        
+        In WAL mode recent commits live in the -wal sidecar file until
+        checkpointed, so the database file must be checkpointed before
+        it is copied or overwritten.
+        """
+        if not self.database_path.exists():
+            return
+        
+        try:
+            conn = sqlite3.connect(str(self.database_path))
+            try:
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            pass
+    
     def list_backups(self) -> List[Tuple[Path, Optional[str]]]:
         """
         List all available backups.
@@ -157,38 +330,43 @@ class DatabaseBackupManager:
         Returns:
             List of tuples containing (backup_path, description)
         """
-        backups = []
+        # One directory scan: partition backups and metadata files by name
+        # using plain suffix checks (no glob pattern compilation)
+        backup_ext = self.BACKUP_EXTENSION
+        metadata_ext = self.METADATA_EXTENSION
+        metadata_suffix_len = len(metadata_ext) - len(backup_ext)
+        backup_entries = {}
+        metadata_entries = {}
+        with os.scandir(self.backups_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.endswith(backup_ext):
+                    backup_entries[name] = entry
+                elif name.endswith(metadata_ext):
+                    metadata_entries[name[:-metadata_suffix_len]] = entry
         
-        for backup_file in self.backups_dir.glob(f"*{self.BACKUP_EXTENSION}"):
-            # Skip metadata files
-            if backup_file.suffix == ".meta":
-                continue
-            
+        backups = []
+        for name, entry in backup_entries.items():
             # Try to read metadata
             description = None
-            metadata_path = backup_file.with_suffix(self.BACKUP_EXTENSION + ".meta")
-            if metadata_path.exists():
-                try:
-                    with open(metadata_path, "r") as f:
-                        lines = f.readlines()
-                        for line in lines:
-                            if line.startswith("description:"):
-                                description = line.replace("description:", "").strip()
-                except Exception:
-                    pass
+            metadata_entry = metadata_entries.get(name)
+            if metadata_entry is not None:
+                description = _read_description(metadata_entry.path)
             
-            backups.append((backup_file, description))
+            backups.append((entry, description))
         
-        # Sort by modification time (newest first)
+        # Sort by modification time (newest first); DirEntry caches the stat
         backups.sort(key=lambda x: x[0].stat().st_mtime, reverse=True)
         
-        return backups
+        return [(Path(entry.path), description) for entry, description in backups]
     
     def restore_backup(self, backup_path: Path) -> bool:
         """
         Restore a database from backup.
         
-        Creates a backup of current database before restoring.
+        Creates a backup of current database before restoring, and brings
+        a backup from an older schema version up to date afterwards (e.g.
+        recreating the revenue cache table and its triggers).
         
         Args:
             backup_path: Path to the backup file
@@ -209,7 +387,13 @@ class DatabaseBackupManager:
                 safety_backup = self.create_backup(description="Auto-backup before restore")
             
             # Restore from backup
-            shutil.copy2(backup_path, self.database_path)
+            self._checkpoint_database()
+            _fastcopy(backup_path, self.database_path)
+            bump_generation(self.database_path)
+            
+            # Imported here: app.db.init imports this module
+            from app.db.init import initialize_database
+            initialize_database(self.database_path)
             
             return True
         
@@ -231,7 +415,7 @@ class DatabaseBackupManager:
                 backup_path.unlink()
             
             # Delete metadata file if exists
-            metadata_path = backup_path.with_suffix(".backup.meta")
+            metadata_path = backup_path.with_suffix(self.METADATA_EXTENSION)
             if metadata_path.exists():
                 metadata_path.unlink()
             
@@ -266,15 +450,6 @@ class DatabaseBackupManager:
         }
         
         # Read description from metadata
-        metadata_path = backup_path.with_suffix(".backup.meta")
-        if metadata_path.exists():
-            try:
-                with open(metadata_path, "r") as f:
-                    for line in f:
-                        if line.startswith("description:"):
-                            info["description"] = line.replace("description:", "").strip()
-                            break
-            except Exception:
-                pass
+        info["description"] = _read_description(backup_path.with_suffix(self.METADATA_EXTENSION))
         
         return info
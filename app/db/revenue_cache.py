@@ -0,0 +1,100 @@
+"""Per-day revenue totals kept up to date by triggers on the sessions table."""
+
+from app.db.connection import DatabaseConnection
+
+
+# Columns of daily_revenue_cache after the date key, each paired with the
+# per-session amount it accumulates (row is NEW or OLD inside a trigger)
+_REVENUE_COLUMNS = (
+    ("cash_total", "CASE WHEN {row}.payment_method = 'Cash' AND {row}.payment_status = 'PAID' THEN {row}.total_due ELSE 0 END"),
+    ("online_total", "CASE WHEN {row}.payment_method = 'Online' AND {row}.payment_status = 'PAID' THEN {row}.total_due ELSE 0 END"),
+    ("mixed_total", "CASE WHEN {row}.payment_method = 'Mixed' AND {row}.payment_status = 'PAID' THEN {row}.total_due ELSE 0 END"),
+    ("pending_total", "CASE WHEN {row}.payment_status = 'Pending' THEN {row}.total_due ELSE 0 END"),
+    ("session_count", "1"),
+    ("total_revenue", "CASE WHEN {row}.payment_status = 'PAID' THEN {row}.total_due ELSE 0 END"),
+)
+
+REVENUE_COLUMN_NAMES = tuple(name for name, _ in _REVENUE_COLUMNS)
+
+# Only changes to these columns can move a day's totals
+_TRACKED_COLUMNS = "session_state, date, payment_method, payment_status, total_due"
+
+
+def _apply_session(row: str, sign: str) -> str:
+    """
+    Build an upsert adding (sign '+') or removing (sign '-') one completed
+    session's amounts to its day's totals.
+    
+    Args:
+        row: 'NEW' or 'OLD'
+        sign: '+' or '-'
+    
+    Returns:
+        INSERT ... ON CONFLICT statement for use inside a trigger body
+    """
+    values = ", ".join(f"{sign}({expr.format(row=row)})" for _, expr in _REVENUE_COLUMNS)
+    updates = ", ".join(f"{name} = {name} + excluded.{name}" for name in REVENUE_COLUMN_NAMES)
+    return (
+        f"INSERT INTO daily_revenue_cache (date, {', '.join(REVENUE_COLUMN_NAMES)}) "
+        f"VALUES ({row}.date, {values}) "
+        f"ON CONFLICT(date) DO UPDATE SET {updates};"
+    )
+
+
+REVENUE_CACHE_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS daily_revenue_cache (
+    date DATE PRIMARY KEY,
+    cash_total REAL NOT NULL DEFAULT 0,
+    online_total REAL NOT NULL DEFAULT 0,
+    mixed_total REAL NOT NULL DEFAULT 0,
+    pending_total REAL NOT NULL DEFAULT 0,
+    session_count INTEGER NOT NULL DEFAULT 0,
+    total_revenue REAL NOT NULL DEFAULT 0
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_revenue_insert
+AFTER INSERT ON sessions WHEN NEW.session_state = 'COMPLETED'
+BEGIN
+    {_apply_session("NEW", "+")}
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_revenue_delete
+AFTER DELETE ON sessions WHEN OLD.session_state = 'COMPLETED'
+BEGIN
+    {_apply_session("OLD", "-")}
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_revenue_update_old
+AFTER UPDATE OF {_TRACKED_COLUMNS} ON sessions WHEN OLD.session_state = 'COMPLETED'
+BEGIN
+    {_apply_session("OLD", "-")}
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_revenue_update_new
+AFTER UPDATE OF {_TRACKED_COLUMNS} ON sessions WHEN NEW.session_state = 'COMPLETED'
+BEGIN
+    {_apply_session("NEW", "+")}
+END;
+"""
+
+
+def rebuild_revenue_cache(db: DatabaseConnection):
+    """
+    Recompute every day's totals from the sessions table in one scan.
+    
+    Used when the cache is first created (or after a migration rebuilt the
+    sessions table) so it starts out consistent with existing sessions.
+    
+    Args:
+        db: DatabaseConnection instance
+    """
+    sums = ", ".join(f"SUM({expr.format(row='s')})" for _, expr in _REVENUE_COLUMNS)
+    with db.transaction():
+        db.delete("DELETE FROM daily_revenue_cache")
+        db.insert(
+            f"""INSERT INTO daily_revenue_cache (date, {', '.join(REVENUE_COLUMN_NAMES)})
+               SELECT s.date, {sums}
+               FROM sessions s
+               WHERE s.session_state = 'COMPLETED'
+               GROUP BY s.date"""
+        )
@@ -6,11 +6,14 @@ Built with Python, Tkinter, and SQLite.
 """
 
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-# Add workspace root to path so imports work correctly
-WORKSPACE_ROOT = Path(__file__).parent.parent
-sys.path.insert(0, str(WORKSPACE_ROOT))
+# Preferred entry point is `python -m app.main`, which needs no path setup.
+# Only when launched directly as a script (python app/main.py) is the
+# workspace root missing from sys.path, so add it in that case alone.
+if not __package__:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import tkinter as tk
 from tkinter import messagebox
@@ -21,15 +24,20 @@ from app.db.init import initialize_database
 def main():
     """Initialize and start the application."""
     try:
-        # Initialize database (creates tables if first run)
-        # Database is stored in user's AppData directory
-        db = initialize_database()
-        
-        # Create root window
-        root = tk.Tk()
-        root.title("Gaming Cafe Manager")
-        root.geometry("1000x700")
-        root.minsize(800, 600)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # Initialize database (creates tables if first run) in the
+            # background while Tk loads; the two are independent.
+            # Database is stored in user's AppData directory
+            db_future = executor.submit(initialize_database)
+            
+            # Create root window
+            root = tk.Tk()
+            root.title("Gaming Cafe Manager")
+            root.geometry("1000x700")
+            root.minsize(800, 600)
+            
+            # Wait for the database; re-raises any initialization error
+            db = db_future.result()
         
         # Initialize main UI with database connection and database path
         app = MainWindow(root, db, db.db_path)
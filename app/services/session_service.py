@@ -1,9 +1,62 @@
 """Session management service for gaming cafe sessions."""
 
-from typing import List, Dict, Any, Optional
+import functools
+from typing import List, Dict, Any, Iterator, Optional, Sequence, Tuple
 from dataclasses import dataclass
-from datetime import datetime, time
+from datetime import datetime, time, timezone
 from app.db.connection import DatabaseConnection
+from app.db.revenue_cache import REVENUE_COLUMN_NAMES
+from app.services.system_service import SystemService
+
+
+MINUTES_PER_DAY = 24 * 60
+
+def _parse_hms(value: str) -> int:
+    """
+    Convert a zero-padded 24-hour HH:MM:SS string to seconds since midnight.
+    
+    Checks the fixed layout directly instead of going through strptime,
+    which interprets its format string on every call.
+    
+    Args:
+        value: Time string in HH:MM:SS format
+    
+    Returns:
+        Seconds since midnight
+    
+    Raises:
+        ValueError: If value is not a valid zero-padded HH:MM:SS time
+    """
+    if (
+        len(value) != 8 or value[2] != ":" or value[5] != ":" or not value.isascii()
+        or not (value[:2].isdigit() and value[3:5].isdigit() and value[6:].isdigit())
+    ):
+        raise ValueError(f"Expected HH:MM:SS, got: {value}")
+    hours, minutes, seconds = int(value[:2]), int(value[3:5]), int(value[6:])
+    if hours > 23 or minutes > 59 or seconds > 59:
+        raise ValueError(f"Time out of range: {value}")
+    return hours * 3600 + minutes * 60 + seconds
+
+
+def _utc_timestamp() -> str:
+    """
+    Current UTC time in SQLite's CURRENT_TIMESTAMP format.
+    
+    Bound as a parameter so a call (or a whole batch) writes one
+    timestamp computed in Python rather than by SQLite per statement.
+    
+    Returns:
+        Timestamp string (YYYY-MM-DD HH:MM:SS)
+    """
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+# Whole minutes from login_time (HH:MM:SS) to a bound logout minute-of-day,
+# wrapped into [0, MINUTES_PER_DAY) so overnight sessions stay positive
+_DURATION_SQL = (
+    "(((? - (CAST(substr(login_time, 1, 2) AS INTEGER) * 60"
+    " + CAST(substr(login_time, 4, 2) AS INTEGER))) % 1440 + 1440) % 1440)"
+)
 
 
 class SessionError(Exception):
@@ -11,7 +64,31 @@ class SessionError(Exception):
     pass
 
 
-@dataclass
+def _check_batch_item(index: int, item: Any, required: Tuple[str, ...], optional: Tuple[str, ...]):
+    """
+    Check one batch item's keys before it is unpacked as keyword arguments.
+    
+    Args:
+        index: Position of the item in the batch (for the error message)
+        item: The batch item
+        required: Keys the item must have
+        optional: Keys the item may have
+    
+    Raises:
+        SessionError: If the item is not a dictionary, lacks a required key
+            or has an unknown one
+    """
+    if not isinstance(item, dict):
+        raise SessionError(f"Batch item {index} must be a dictionary.")
+    missing = [key for key in required if key not in item]
+    if missing:
+        raise SessionError(f"Batch item {index} is missing: {', '.join(missing)}")
+    unknown = sorted(set(item).difference(required, optional))
+    if unknown:
+        raise SessionError(f"Batch item {index} has unknown fields: {', '.join(unknown)}")
+
+
+@dataclass(slots=True, frozen=True)
 class Session:
     """Represents a gaming session with prepaid-first workflow."""
     id: int
@@ -45,17 +122,111 @@ class Session:
         return self.session_state == "COMPLETED"
 
 
+# Shown for sessions whose system has since been deleted
+DELETED_SYSTEM_NAME = "Deleted System"
+
 class SessionService:
     """Service layer for session operations."""
     
-    def __init__(self, db: DatabaseConnection):
+    # Shared SELECT for building Session objects, with columns in Session
+    # field order (minus system_name, filled in from SystemService's cached
+    # id -> name map instead of a JOIN); the hot lookups below are kept as
+    # constants so the connection's statement cache reuses one compiled
+    # statement per query instead of re-parsing the SQL each call
+    _SESSION_SELECT = """SELECT s.id, s.date, s.customer_name, s.system_id,
+                      s.session_state, s.planned_duration_min, s.login_time, s.logout_time,
+                      s.actual_duration_min, s.hourly_rate, s.paid_amount, s.extra_charges, 
+                      s.total_due, s.payment_method, s.payment_status, s.notes
+               FROM sessions s"""
+    _SQL_BY_ID = _SESSION_SELECT + """
+               WHERE s.id = ?"""
+    _SQL_ACTIVE = _SESSION_SELECT + """
+               WHERE s.session_state = 'ACTIVE'
+               ORDER BY s.login_time DESC"""
+    _SQL_BY_DATE = _SESSION_SELECT + """
+               WHERE s.date = ?
+               ORDER BY s.login_time DESC"""
+    _ORDER_BY_DATE = """
+               ORDER BY s.date DESC, s.login_time DESC"""
+    _SQL_PENDING = _SESSION_SELECT + """
+               WHERE s.payment_status = 'Pending'""" + _ORDER_BY_DATE
+    _SQL_PLANNED = _SESSION_SELECT + """
+               WHERE s.session_state = 'PLANNED'
+               ORDER BY s.date DESC, s.id DESC"""
+    # One statement per valid state; the state is a fixed literal, so it is
+    # inlined and the lookup doubles as validation
+    _SQL_BY_STATE = {
+        "PLANNED": _SESSION_SELECT + """
+               WHERE s.session_state = 'PLANNED'""" + _ORDER_BY_DATE,
+        "ACTIVE": _SESSION_SELECT + """
+               WHERE s.session_state = 'ACTIVE'""" + _ORDER_BY_DATE,
+        "COMPLETED": _SESSION_SELECT + """
+               WHERE s.session_state = 'COMPLETED'""" + _ORDER_BY_DATE,
+    }
+    # ISO dates compare as text, so open range ends use sentinel bounds and
+    # every state/date-range lookup shares one statement
+    _MIN_DATE = "0000-01-01"
+    _MAX_DATE = "9999-12-31"
+    _SQL_STATE_RANGE = _SESSION_SELECT + """
+               WHERE s.session_state = ? AND s.date >= ? AND s.date <= ?""" + _ORDER_BY_DATE
+    
+    # Completes a session in one guarded UPDATE: the duration is computed
+    # from the stored login_time (the modulo wraps overnight sessions past
+    # midnight) and total_due from paid_amount
+    _SQL_END_SESSION = f"""UPDATE sessions 
+                   SET session_state = 'COMPLETED', logout_time = ?, actual_duration_min = {_DURATION_SQL}, 
+                       extra_charges = ?, total_due = paid_amount + ?, notes = ?, updated_at = ?
+                   WHERE id = ? AND session_state = 'ACTIVE' AND login_time IS NOT NULL
+                     AND {_DURATION_SQL} > 0"""
+    
+    # One statement serves both single-day and range revenue lookups
+    _SQL_REVENUE_BETWEEN = (
+        "SELECT " + ", ".join(f"COALESCE(SUM({name}), 0)" for name in REVENUE_COLUMN_NAMES)
+        + " FROM daily_revenue_cache WHERE date BETWEEN ? AND ?"
+    )
+    
+    _SQL_INSERT_PREPAID = """INSERT INTO sessions 
+                   (date, customer_name, system_id, session_state, planned_duration_min, 
+                    hourly_rate, paid_amount, extra_charges, total_due, payment_method, 
+                    payment_status, notes)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+    
+    # Matches the CHECK constraint on sessions.payment_method
+    _PAYMENT_METHODS = ("Cash", "Online", "Mixed")
+    
+    # Required and optional keys of a create_prepaid_sessions() item
+    _PREPAID_ITEM_KEYS = ("date", "customer_name", "system_id", "planned_duration_min",
+                          "hourly_rate", "payment_method")
+    _PREPAID_ITEM_OPTIONAL_KEYS = ("extra_charges", "notes")
+    
+    # Required and optional keys of an end_sessions() item
+    _END_ITEM_KEYS = ("session_id", "logout_time")
+    _END_ITEM_OPTIONAL_KEYS = ("extra_charges", "notes")
+    
+    # Maximum IDs bound into one "IN (...)" clause by the bulk updates
+    BULK_CHUNK_SIZE = 500
+    
+    # Matches the CHECK constraint on sessions.payment_status
+    _VALID_PAYMENT_STATUSES = frozenset({"PAID", "Pending", "Refunded"})
+    
+    def __init__(self, db: DatabaseConnection, system_service: Optional[SystemService] = None):
         """
         Initialize session service.
         
         Args:
             db: DatabaseConnection instance
+            system_service: SystemService used to resolve system names
+                (defaults to one on the same connection)
         """
         self.db = db
+        self.system_service = system_service or SystemService(db)
+        # Memoized reads, keyed on their arguments plus db.cache_key: any
+        # write (through this connection, another connection, or a restored
+        # backup) moves the key, so stale entries are simply never looked up
+        # again
+        self._cached_session_by_id = functools.lru_cache(maxsize=256)(self._fetch_session_by_id)
+        self._cached_revenue = functools.lru_cache(maxsize=64)(self._fetch_revenue_between)
+        self._cached_sessions = functools.lru_cache(maxsize=8)(self._fetch_sessions)
     
     def create_session(
         self,
@@ -136,6 +307,71 @@ class SessionService:
         Returns:
             ID of created session
         
+        Raises:
+            SessionError: If validation fails
+        """
+        params = self._prepaid_session_params(
+            date, customer_name, system_id, planned_duration_min,
+            hourly_rate, payment_method, extra_charges, notes
+        )
+        
+        try:
+            return self.db.insert(self._SQL_INSERT_PREPAID, params)
+        except Exception as e:
+            raise SessionError(f"Failed to create prepaid session: {str(e)}")
+    
+    def create_prepaid_sessions(self, items: Sequence[Dict[str, Any]]) -> int:
+        """
+        Create several prepaid sessions in PLANNED state at once.
+        
+        Every item is validated before anything is written, then all rows
+        are inserted with one prepared statement in a single transaction.
+        
+        Args:
+            items: Sequence of dictionaries with create_prepaid_session()
+                keyword arguments
+        
+        Returns:
+            Number of sessions created
+        
+        Raises:
+            SessionError: If any item fails validation or has missing or
+                unknown keys (nothing is inserted)
+        """
+        rows = []
+        for index, item in enumerate(items):
+            _check_batch_item(index, item, self._PREPAID_ITEM_KEYS, self._PREPAID_ITEM_OPTIONAL_KEYS)
+            rows.append(self._prepaid_session_params(**item))
+        if not rows:
+            return 0
+        
+        try:
+            return self.db.insert_many(self._SQL_INSERT_PREPAID, rows)
+        except Exception as e:
+            raise SessionError(f"Failed to create prepaid sessions: {str(e)}")
+    
+    def _prepaid_session_params(
+        self,
+        date: str,
+        customer_name: str,
+        system_id: int,
+        planned_duration_min: int,
+        hourly_rate: float,
+        payment_method: str,
+        extra_charges: float = 0.0,
+        notes: Optional[str] = None
+    ) -> tuple:
+        """
+        Validate prepaid session input and build its INSERT parameters.
+        
+        All checks run up front in a single pass, before any database work.
+        
+        Args:
+            Same as create_prepaid_session()
+        
+        Returns:
+            Parameter tuple for _SQL_INSERT_PREPAID
+        
         Raises:
             SessionError: If validation fails
         """
@@ -166,9 +402,8 @@ class SessionService:
             raise SessionError("Hourly rate seems unusually high. Please verify.")
         
         # Validate payment method
-        valid_methods = ["Cash", "Online", "Mixed"]
-        if payment_method not in valid_methods:
-            raise SessionError(f"Invalid payment method. Must be one of: {', '.join(valid_methods)}")
+        if payment_method not in self._PAYMENT_METHODS:
+            raise SessionError(f"Invalid payment method. Must be one of: {', '.join(self._PAYMENT_METHODS)}")
         
         # Validate extra charges
         if not isinstance(extra_charges, (int, float)) or extra_charges < 0:
@@ -178,23 +413,13 @@ class SessionService:
         if notes and len(notes) > 500:
             raise SessionError("Notes exceed maximum length (500 characters).")
         
-        try:
-            # Calculate paid amount (hourly_rate * (duration_min / 60) + extra_charges)
-            hours = planned_duration_min / 60.0
-            paid_amount = (hourly_rate * hours) + extra_charges
-            
-            return self.db.insert(
-                """INSERT INTO sessions 
-                   (date, customer_name, system_id, session_state, planned_duration_min, 
-                    hourly_rate, paid_amount, extra_charges, total_due, payment_method, 
-                    payment_status, notes)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                (date, customer_name, system_id, "PLANNED", planned_duration_min,
-                 hourly_rate, paid_amount, extra_charges, paid_amount, payment_method,
-                 "PAID", notes)
-            )
-        except Exception as e:
-            raise SessionError(f"Failed to create prepaid session: {str(e)}")
+        # Calculate paid amount; multiplying before dividing keeps whole-rupee
+        # rates exact until the single division by 60
+        paid_amount = hourly_rate * planned_duration_min / 60.0 + extra_charges
+        
+        return (date, customer_name, system_id, "PLANNED", planned_duration_min,
+                hourly_rate, paid_amount, extra_charges, paid_amount, payment_method,
+                "PAID", notes)
     
     def start_session(self, session_id: int, login_time: str) -> bool:
         """
@@ -221,27 +446,35 @@ class SessionService:
             raise SessionError("Invalid login time format.")
         
         try:
-            datetime.strptime(login_time, "%H:%M:%S")
+            _parse_hms(login_time)
         except ValueError:
-            raise SessionError(f"Invalid login time format. Expected HH:MM:SS, got: {login_time}")
+            try:
+                # Store zero-padded so end_session can slice hours/minutes
+                # in SQL; strptime also accepts unpadded fields like 9:05:00
+                login_time = datetime.strptime(login_time, "%H:%M:%S").strftime("%H:%M:%S")
+            except ValueError:
+                raise SessionError(f"Invalid login time format. Expected HH:MM:SS, got: {login_time}")
         
         try:
-            # Fetch session
-            session = self.get_session_by_id(session_id)
-            if not session:
-                raise SessionError(f"Session {session_id} not found.")
-            
-            if session.session_state != "PLANNED":
-                raise SessionError(f"Can only start PLANNED sessions. Current state: {session.session_state}")
-            
-            # Update session: set to ACTIVE and record login_time
+            # Update session: set to ACTIVE and record login_time, guarded
+            # so only a PLANNED session can transition
             rows_affected = self.db.update(
                 """UPDATE sessions 
-                   SET session_state = 'ACTIVE', login_time = ?, updated_at = CURRENT_TIMESTAMP
-                   WHERE id = ?""",
-                (login_time, session_id)
+                   SET session_state = 'ACTIVE', login_time = ?, updated_at = ?
+                   WHERE id = ? AND session_state = 'PLANNED'""",
+                (login_time, _utc_timestamp(), session_id)
+            )
+            if rows_affected:
+                return True
+            
+            # Nothing was updated; look up why so the caller gets a precise error
+            row = self.db.fetch_one(
+                "SELECT session_state FROM sessions WHERE id = ?",
+                (session_id,)
             )
-            return rows_affected > 0
+            if not row:
+                raise SessionError(f"Session {session_id} not found.")
+            raise SessionError(f"Can only start PLANNED sessions. Current state: {row['session_state']}")
         
         except SessionError:
             raise
@@ -273,6 +506,84 @@ class SessionService:
         Returns:
             True if successful, False otherwise
         
+        Raises:
+            SessionError: If validation fails
+        """
+        params = self._end_session_params(session_id, logout_time, extra_charges, notes)
+        
+        try:
+            rows_affected = self.db.update(self._SQL_END_SESSION, params)
+            if rows_affected:
+                return True
+            
+            # Nothing was updated; look up why so the caller gets a precise error
+            row = self.db.fetch_one(
+                "SELECT session_state, login_time FROM sessions WHERE id = ?",
+                (session_id,)
+            )
+            if not row:
+                raise SessionError(f"Session {session_id} not found.")
+            if row["session_state"] != "ACTIVE":
+                raise SessionError(f"Can only end ACTIVE sessions. Current state: {row['session_state']}")
+            if not row["login_time"]:
+                raise SessionError(f"Session {session_id} has no login time recorded.")
+            raise SessionError("Logout time must be after login time.")
+        
+        except SessionError:
+            raise
+        except Exception as e:
+            raise SessionError(f"Failed to end session: {str(e)}")
+    
+    def end_sessions(self, items: Sequence[Dict[str, Any]]) -> int:
+        """
+        End several ACTIVE sessions in one transaction.
+        
+        Every item is validated before anything is written, and the UPDATEs
+        run as one prepared statement with a single commit. Sessions that
+        are not ACTIVE (or whose logout time is not after login) are left
+        unchanged and not counted.
+        
+        Args:
+            items: Sequence of dictionaries with end_session() keyword
+                arguments
+        
+        Returns:
+            Number of sessions completed
+        
+        Raises:
+            SessionError: If any item fails validation or has missing or
+                unknown keys (nothing is updated)
+        """
+        updated_at = _utc_timestamp()  # One timestamp for the whole batch
+        rows = []
+        for index, item in enumerate(items):
+            _check_batch_item(index, item, self._END_ITEM_KEYS, self._END_ITEM_OPTIONAL_KEYS)
+            rows.append(self._end_session_params(**item, updated_at=updated_at))
+        if not rows:
+            return 0
+        
+        try:
+            return self.db.update_many(self._SQL_END_SESSION, rows)
+        except Exception as e:
+            raise SessionError(f"Failed to end sessions: {str(e)}")
+    
+    def _end_session_params(
+        self,
+        session_id: int,
+        logout_time: str,
+        extra_charges: float = 0.0,
+        notes: str = "",
+        updated_at: Optional[str] = None
+    ) -> tuple:
+        """
+        Validate end-session input and build its UPDATE parameters.
+        
+        Args:
+            Same as end_session(), plus the updated_at timestamp to write
+        
+        Returns:
+            Parameter tuple for _SQL_END_SESSION
+        
         Raises:
             SessionError: If validation fails
         """
@@ -284,11 +595,18 @@ class SessionService:
         if not logout_time or not isinstance(logout_time, str):
             raise SessionError("Invalid logout time format.")
         
+        # Validate time format (HH:MM:SS)
         try:
-            # Validate time format (HH:MM:SS)
-            datetime.strptime(logout_time, "%H:%M:%S")
+            logout_seconds = _parse_hms(logout_time)
         except ValueError:
-            raise SessionError(f"Invalid logout time format. Expected HH:MM:SS, got: {logout_time}")
+            try:
+                # Store zero-padded like start_session(); strptime also
+                # accepts unpadded fields like 9:05:00
+                logout_time = datetime.strptime(logout_time, "%H:%M:%S").strftime("%H:%M:%S")
+            except ValueError:
+                raise SessionError(f"Invalid logout time format. Expected HH:MM:SS, got: {logout_time}")
+            logout_seconds = _parse_hms(logout_time)
+        logout_minutes = logout_seconds // 60
         
         # Validate extra charges
         if not isinstance(extra_charges, (int, float)) or extra_charges < 0:
@@ -301,55 +619,8 @@ class SessionService:
         if notes and len(notes) > 500:
             raise SessionError("Notes exceed maximum length (500 characters).")
         
-        try:
-            # Fetch session
-            session = self.get_session_by_id(session_id)
-            if not session:
-                raise SessionError(f"Session {session_id} not found.")
-            
-            # Verify session is in ACTIVE state
-            if session.session_state != "ACTIVE":
-                raise SessionError(f"Can only end ACTIVE sessions. Current state: {session.session_state}")
-            
-            # Verify login_time exists
-            if not session.login_time:
-                raise SessionError(f"Session {session_id} has no login time recorded.")
-            
-            # Calculate actual duration in minutes
-            login = datetime.strptime(session.login_time, "%H:%M:%S").time()
-            logout = datetime.strptime(logout_time, "%H:%M:%S").time()
-            
-            # Handle overnight sessions
-            login_minutes = login.hour * 60 + login.minute
-            logout_minutes = logout.hour * 60 + logout.minute
-            
-            if logout_minutes < login_minutes:
-                # Overnight session
-                actual_duration_min = (24 * 60 - login_minutes) + logout_minutes
-            else:
-                actual_duration_min = logout_minutes - login_minutes
-            
-            # Ensure duration is positive
-            if actual_duration_min <= 0:
-                raise SessionError("Logout time must be after login time.")
-            
-            # Calculate new total_due if there are extra charges
-            new_total_due = session.paid_amount + extra_charges
-            
-            # Update session: transition to COMPLETED, record logout_time and actual duration
-            rows_affected = self.db.update(
-                """UPDATE sessions 
-                   SET session_state = 'COMPLETED', logout_time = ?, actual_duration_min = ?, 
-                       extra_charges = ?, total_due = ?, notes = ?, updated_at = CURRENT_TIMESTAMP
-                   WHERE id = ?""",
-                (logout_time, actual_duration_min, extra_charges, new_total_due, notes, session_id)
-            )
-            return rows_affected > 0
-        
-        except SessionError:
-            raise
-        except Exception as e:
-            raise SessionError(f"Failed to end session: {str(e)}")
+        return (logout_time, logout_minutes, extra_charges, extra_charges, notes,
+                updated_at or _utc_timestamp(), session_id, logout_minutes)
     
     def get_session_by_id(self, session_id: int) -> Optional[Session]:
         """
@@ -361,18 +632,16 @@ class SessionService:
         Returns:
             Session object or None if not found
         """
-        row = self.db.fetch_one(
-            """SELECT s.id, s.date, s.customer_name, s.system_id, 
-                      COALESCE(sy.system_name, 'Deleted System') as system_name,
-                      s.login_time, s.logout_time, s.session_state, s.planned_duration_min,
-                      s.actual_duration_min, s.hourly_rate, s.extra_charges, s.total_due, 
-                      s.paid_amount, s.payment_method, s.payment_status, s.notes
-               FROM sessions s
-               LEFT JOIN systems sy ON s.system_id = sy.id
-               WHERE s.id = ?""",
-            (session_id,)
-        )
-        return self._row_to_session(row) if row else None
+        return self._cached_session_by_id(session_id, self.db.cache_key)
+    
+    def _fetch_session_by_id(self, session_id: int, cache_key: tuple) -> Optional[Session]:
+        """Load one session; cache_key only keys the memoized wrapper."""
+        rows = self.db.fetch_all_tuples(self._SQL_BY_ID, (session_id,))
+        return self._rows_to_sessions(rows)[0] if rows else None
+    
+    def _fetch_sessions(self, query: str, cache_key: tuple) -> Tuple[Session, ...]:
+        """Run a parameterless session SELECT; cache_key only keys the memoized wrapper."""
+        return tuple(self._rows_to_sessions(self.db.fetch_all_tuples(query)))
     
     def get_active_sessions(self) -> List[Session]:
         """
@@ -381,18 +650,8 @@ class SessionService:
         Returns:
             List of active Session objects
         """
-        rows = self.db.fetch_all(
-            """SELECT s.id, s.date, s.customer_name, s.system_id, 
-                      COALESCE(sy.system_name, 'Deleted System') as system_name,
-                      s.login_time, s.logout_time, s.session_state, s.planned_duration_min,
-                      s.actual_duration_min, s.hourly_rate, s.extra_charges, s.total_due, 
-                      s.paid_amount, s.payment_method, s.payment_status, s.notes
-               FROM sessions s
-               LEFT JOIN systems sy ON s.system_id = sy.id
-               WHERE s.session_state = 'ACTIVE'
-               ORDER BY s.login_time DESC"""
-        )
-        return [self._row_to_session(row) for row in rows]
+        # Polled by the dashboard; reuses the last result until a write
+        return list(self._cached_sessions(self._SQL_ACTIVE, self.db.cache_key))
     
     def get_sessions_by_date(self, date: str) -> List[Session]:
         """
@@ -404,19 +663,11 @@ class SessionService:
         Returns:
             List of Session objects
         """
-        rows = self.db.fetch_all(
-            """SELECT s.id, s.date, s.customer_name, s.system_id, 
-                      COALESCE(sy.system_name, 'Deleted System') as system_name,
-                      s.login_time, s.logout_time, s.session_state, s.planned_duration_min,
-                      s.actual_duration_min, s.hourly_rate, s.extra_charges, s.total_due, 
-                      s.paid_amount, s.payment_method, s.payment_status, s.notes
-               FROM sessions s
-               LEFT JOIN systems sy ON s.system_id = sy.id
-               WHERE s.date = ?
-               ORDER BY s.login_time DESC""",
+        rows = self.db.fetch_all_tuples(
+            self._SQL_BY_DATE,
             (date,)
         )
-        return [self._row_to_session(row) for row in rows]
+        return self._rows_to_sessions(rows)
     
     def get_pending_sessions(self) -> List[Session]:
         """
@@ -425,18 +676,7 @@ class SessionService:
         Returns:
             List of Session objects with payment_status = 'Pending'
         """
-        rows = self.db.fetch_all(
-            """SELECT s.id, s.date, s.customer_name, s.system_id, 
-                      COALESCE(sy.system_name, 'Deleted System') as system_name,
-                      s.login_time, s.logout_time, s.session_state, s.planned_duration_min,
-                      s.actual_duration_min, s.hourly_rate, s.extra_charges, s.total_due, 
-                      s.paid_amount, s.payment_method, s.payment_status, s.notes
-               FROM sessions s
-               LEFT JOIN systems sy ON s.system_id = sy.id
-               WHERE s.payment_status = 'Pending'
-               ORDER BY s.date DESC, s.login_time DESC"""
-        )
-        return [self._row_to_session(row) for row in rows]
+        return list(self._cached_sessions(self._SQL_PENDING, self.db.cache_key))
     
     def get_completed_sessions(self, start_date: str = None, end_date: str = None) -> List[Session]:
         """
@@ -449,47 +689,51 @@ class SessionService:
         Returns:
             List of Session objects with session_state = 'COMPLETED'
         """
-        if start_date and end_date:
-            rows = self.db.fetch_all(
-                """SELECT s.id, s.date, s.customer_name, s.system_id, 
-                          COALESCE(sy.system_name, 'Deleted System') as system_name,
-                          s.login_time, s.logout_time, s.session_state, s.planned_duration_min,
-                          s.actual_duration_min, s.hourly_rate, s.extra_charges, s.total_due, 
-                          s.paid_amount, s.payment_method, s.payment_status, s.notes
-                   FROM sessions s
-                   LEFT JOIN systems sy ON s.system_id = sy.id
-                   WHERE s.session_state = 'COMPLETED'
-                   AND s.date >= ? AND s.date <= ?
-                   ORDER BY s.date DESC, s.login_time DESC""",
-                (start_date, end_date)
-            )
-        elif start_date:
-            rows = self.db.fetch_all(
-                """SELECT s.id, s.date, s.customer_name, s.system_id, 
-                          COALESCE(sy.system_name, 'Deleted System') as system_name,
-                          s.login_time, s.logout_time, s.session_state, s.planned_duration_min,
-                          s.actual_duration_min, s.hourly_rate, s.extra_charges, s.total_due, 
-                          s.paid_amount, s.payment_method, s.payment_status, s.notes
-                   FROM sessions s
-                   LEFT JOIN systems sy ON s.system_id = sy.id
-                   WHERE s.session_state = 'COMPLETED'
-                   AND s.date >= ?
-                   ORDER BY s.date DESC, s.login_time DESC""",
-                (start_date,)
-            )
-        else:
-            rows = self.db.fetch_all(
-                """SELECT s.id, s.date, s.customer_name, s.system_id, 
-                          COALESCE(sy.system_name, 'Deleted System') as system_name,
-                          s.login_time, s.logout_time, s.session_state, s.planned_duration_min,
-                          s.actual_duration_min, s.hourly_rate, s.extra_charges, s.total_due, 
-                          s.paid_amount, s.payment_method, s.payment_status, s.notes
-                   FROM sessions s
-                   LEFT JOIN systems sy ON s.system_id = sy.id
-                   WHERE s.session_state = 'COMPLETED'
-                   ORDER BY s.date DESC, s.login_time DESC"""
-            )
-        return [self._row_to_session(row) for row in rows]
+        rows = self.db.fetch_all_tuples(
+            self._SQL_STATE_RANGE,
+            self._state_range_params("COMPLETED", start_date, end_date)
+        )
+        return self._rows_to_sessions(rows)
+    
+    def iter_sessions(
+        self,
+        state: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> Iterator[Session]:
+        """
+        Stream sessions in a state, optionally within a date range.
+        
+        Unlike the list getters, only a small batch of rows is held in
+        memory at a time, which suits long date ranges.
+        
+        Args:
+            state: 'PLANNED', 'ACTIVE', or 'COMPLETED'
+            start_date: Optional start date (YYYY-MM-DD)
+            end_date: Optional end date (YYYY-MM-DD)
+        
+        Yields:
+            Session objects, newest first
+        
+        Raises:
+            ValueError: If state is invalid
+        """
+        if state not in self._SQL_BY_STATE:
+            raise ValueError(f"Invalid session state: {state}")
+        
+        params = self._state_range_params(state, start_date, end_date)
+        names = self.system_service.get_name_map()
+        for row in self.db.iter_tuples(self._SQL_STATE_RANGE, params):
+            yield Session(*row[:4], names.get(row[3], DELETED_SYSTEM_NAME), *row[4:])
+    
+    def _state_range_params(
+        self,
+        state: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> Tuple[str, str, str]:
+        """Bind parameters for _SQL_STATE_RANGE; open bounds become sentinels."""
+        return (state, start_date or self._MIN_DATE, end_date or self._MAX_DATE)
     
     def get_planned_sessions(self) -> List[Session]:
         """
@@ -498,18 +742,8 @@ class SessionService:
         Returns:
             List of Session objects with session_state = 'PLANNED'
         """
-        rows = self.db.fetch_all(
-            """SELECT s.id, s.date, s.customer_name, s.system_id, 
-                      COALESCE(sy.system_name, 'Deleted System') as system_name,
-                      s.login_time, s.logout_time, s.session_state, s.planned_duration_min,
-                      s.actual_duration_min, s.hourly_rate, s.extra_charges, s.total_due, 
-                      s.paid_amount, s.payment_method, s.payment_status, s.notes
-               FROM sessions s
-               LEFT JOIN systems sy ON s.system_id = sy.id
-               WHERE s.session_state = 'PLANNED'
-               ORDER BY s.date DESC, s.id DESC"""
-        )
-        return [self._row_to_session(row) for row in rows]
+        rows = self.db.fetch_all_tuples(self._SQL_PLANNED)
+        return self._rows_to_sessions(rows)
     
     def get_sessions_by_state(self, state: str) -> List[Session]:
         """
@@ -524,23 +758,15 @@ class SessionService:
         Raises:
             ValueError: If state is invalid
         """
-        valid_states = ("PLANNED", "ACTIVE", "COMPLETED")
-        if state not in valid_states:
-            raise ValueError(f"Invalid session state: {state}")
+        try:
+            query = self._SQL_BY_STATE[state]
+        except KeyError:
+            raise ValueError(f"Invalid session state: {state}") from None
         
-        rows = self.db.fetch_all(
-            """SELECT s.id, s.date, s.customer_name, s.system_id, 
-                      COALESCE(sy.system_name, 'Deleted System') as system_name,
-                      s.login_time, s.logout_time, s.session_state, s.planned_duration_min,
-                      s.actual_duration_min, s.hourly_rate, s.extra_charges, s.total_due, 
-                      s.paid_amount, s.payment_method, s.payment_status, s.notes
-               FROM sessions s
-               LEFT JOIN systems sy ON s.system_id = sy.id
-               WHERE s.session_state = ?
-               ORDER BY s.date DESC, s.login_time DESC""",
-            (state,)
-        )
-        return [self._row_to_session(row) for row in rows]
+        rows = self.db.fetch_all_tuples(query)
+        return self._rows_to_sessions(rows)
+    
+    def get_daily_revenue(self, date: str) -> dict:
         """
         Calculate daily revenue summary for a specific date.
         
@@ -556,36 +782,7 @@ class SessionService:
             - mixed_total: Total from mixed payments
             - pending_total: Total from pending payments
         """
-        rows = self.db.fetch_all(
-            """SELECT COALESCE(SUM(CASE WHEN payment_method = 'Cash' AND payment_status = 'PAID' THEN total_due ELSE 0 END), 0) as cash_total,
-                      COALESCE(SUM(CASE WHEN payment_method = 'Online' AND payment_status = 'PAID' THEN total_due ELSE 0 END), 0) as online_total,
-                      COALESCE(SUM(CASE WHEN payment_method = 'Mixed' AND payment_status = 'PAID' THEN total_due ELSE 0 END), 0) as mixed_total,
-                      COALESCE(SUM(CASE WHEN payment_status = 'Pending' THEN total_due ELSE 0 END), 0) as pending_total,
-                      COUNT(*) as session_count,
-                      COALESCE(SUM(CASE WHEN payment_status = 'PAID' THEN total_due ELSE 0 END), 0) as total_revenue
-               FROM sessions
-               WHERE date = ? AND session_state = 'COMPLETED'""",
-            (date,)
-        )
-        
-        if rows and rows[0]:
-            row = rows[0]
-            return {
-                'total_revenue': row['total_revenue'] or 0.0,
-                'session_count': row['session_count'] or 0,
-                'cash_total': row['cash_total'] or 0.0,
-                'online_total': row['online_total'] or 0.0,
-                'mixed_total': row['mixed_total'] or 0.0,
-                'pending_total': row['pending_total'] or 0.0
-            }
-        return {
-            'total_revenue': 0.0,
-            'session_count': 0,
-            'cash_total': 0.0,
-            'online_total': 0.0,
-            'mixed_total': 0.0,
-            'pending_total': 0.0
-        }
+        return self._revenue_between(date, date)
     
     def get_date_range_revenue(self, start_date: str, end_date: str) -> dict:
         """
@@ -598,36 +795,47 @@ class SessionService:
         Returns:
             Dictionary with revenue breakdown by payment method and totals
         """
-        rows = self.db.fetch_all(
-            """SELECT COALESCE(SUM(CASE WHEN payment_method = 'Cash' AND payment_status = 'PAID' THEN total_due ELSE 0 END), 0) as cash_total,
-                      COALESCE(SUM(CASE WHEN payment_method = 'Online' AND payment_status = 'PAID' THEN total_due ELSE 0 END), 0) as online_total,
-                      COALESCE(SUM(CASE WHEN payment_method = 'Mixed' AND payment_status = 'PAID' THEN total_due ELSE 0 END), 0) as mixed_total,
-                      COALESCE(SUM(CASE WHEN payment_status = 'Pending' THEN total_due ELSE 0 END), 0) as pending_total,
-                      COUNT(*) as session_count,
-                      COALESCE(SUM(CASE WHEN payment_status = 'PAID' THEN total_due ELSE 0 END), 0) as total_revenue
-               FROM sessions
-               WHERE date >= ? AND date <= ? AND session_state = 'COMPLETED'""",
-            (start_date, end_date)
-        )
+        return self._revenue_between(start_date, end_date)
+    
+    def _revenue_between(self, start_date: str, end_date: str) -> dict:
+        """
+        Get the revenue summary for an inclusive date range.
+        
+        Results are memoized per connection change count, so repeated
+        redraws of the same report read no rows until a session is written.
+        
+        Args:
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD)
+        
+        Returns:
+            Dictionary with revenue breakdown by payment method and totals
+        """
+        # Copy so callers can't modify the memoized summary
+        return dict(self._cached_revenue(start_date, end_date, self.db.cache_key))
+    
+    def _fetch_revenue_between(self, start_date: str, end_date: str, cache_key: tuple) -> dict:
+        """
+        Sum the cached per-day revenue totals for an inclusive date range.
+        
+        daily_revenue_cache is maintained by triggers on sessions, so this
+        reads one small row per day instead of scanning the sessions.
+        
+        Args:
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD)
+            cache_key: Connection cache key (memoization key only)
+        
+        Returns:
+            Dictionary with revenue breakdown by payment method and totals
+        """
+        rows = self.db.fetch_all_tuples(self._SQL_REVENUE_BETWEEN, (start_date, end_date))
         
-        if rows and rows[0]:
-            row = rows[0]
-            return {
-                'total_revenue': row['total_revenue'] or 0.0,
-                'session_count': row['session_count'] or 0,
-                'cash_total': row['cash_total'] or 0.0,
-                'online_total': row['online_total'] or 0.0,
-                'mixed_total': row['mixed_total'] or 0.0,
-                'pending_total': row['pending_total'] or 0.0
-            }
-        return {
-            'total_revenue': 0.0,
-            'session_count': 0,
-            'cash_total': 0.0,
-            'online_total': 0.0,
-            'mixed_total': 0.0,
-            'pending_total': 0.0
-        }
+        summary = dict(zip(REVENUE_COLUMN_NAMES, rows[0]))
+        for name, value in summary.items():
+            # Totals are kept incrementally; round away float drift
+            summary[name] = int(value) if name == 'session_count' else round(float(value), 2)
+        return summary
     
     def update_payment_status(self, session_id: int, payment_status: str) -> bool:
         """
@@ -647,34 +855,51 @@ class SessionService:
         Raises:
             ValueError: If payment_status is invalid
         """
-        valid_statuses = ("Paid-Cash", "Paid-Online", "Pending")
-        if payment_status not in valid_statuses:
+        if payment_status not in self._VALID_PAYMENT_STATUSES:
             raise ValueError(f"Invalid payment status: {payment_status}")
         
         rows_affected = self.db.update(
-            "UPDATE sessions SET payment_status = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
-            (payment_status, session_id)
+            "UPDATE sessions SET payment_status = ?, updated_at = ? WHERE id = ?",
+            (payment_status, _utc_timestamp(), session_id)
         )
         return rows_affected > 0
     
-    def _row_to_session(self, row) -> Session:
-        """Convert database row to Session object."""
-        return Session(
-            id=row["id"],
-            date=row["date"],
-            customer_name=row["customer_name"],
-            system_id=row["system_id"],
-            system_name=row["system_name"],
-            login_time=row["login_time"],
-            logout_time=row["logout_time"],
-            session_state=row["session_state"],
-            planned_duration_min=row["planned_duration_min"],
-            actual_duration_min=row["actual_duration_min"],
-            hourly_rate=row["hourly_rate"],
-            extra_charges=row["extra_charges"],
-            total_due=row["total_due"],
-            paid_amount=row["paid_amount"],
-            payment_method=row["payment_method"],
-            payment_status=row["payment_status"],
-            notes=row["notes"],
-        )
+    def update_payment_status_bulk(self, session_ids: List[int], payment_status: str) -> int:
+        """
+        Update the payment status of several sessions in one transaction.
+        
+        Args:
+            session_ids: Session IDs to update
+            payment_status: 'PAID', 'Pending', or 'Refunded'
+        
+        Returns:
+            Number of sessions updated
+        
+        Raises:
+            ValueError: If payment_status is invalid
+        """
+        if payment_status not in self._VALID_PAYMENT_STATUSES:
+            raise ValueError(f"Invalid payment status: {payment_status}")
+        
+        session_ids = list(session_ids)
+        updated_at = _utc_timestamp()  # One timestamp for the whole batch
+        rows_affected = 0
+        with self.db.transaction():
+            # Chunk to stay under SQLite's bound-parameter limit
+            for start in range(0, len(session_ids), self.BULK_CHUNK_SIZE):
+                chunk = session_ids[start:start + self.BULK_CHUNK_SIZE]
+                placeholders = ", ".join("?" * len(chunk))
+                rows_affected += self.db.update(
+                    f"""UPDATE sessions SET payment_status = ?, updated_at = ?
+                       WHERE id IN ({placeholders})""",
+                    (payment_status, updated_at, *chunk)
+                )
+        return rows_affected
+    
+    def _rows_to_sessions(self, rows) -> List[Session]:
+        """Convert plain tuple rows (columns in field order) to Session objects."""
+        names = self.system_service.get_name_map()
+        return [
+            Session(*row[:4], names.get(row[3], DELETED_SYSTEM_NAME), *row[4:])
+            for row in rows
+        ]
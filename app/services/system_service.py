@@ -1,11 +1,12 @@
 """System management service for gaming cafe systems/consoles."""
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 from app.db.connection import DatabaseConnection
 
 
-@dataclass
+# Frozen because instances are shared through SystemService's cache
+@dataclass(slots=True, frozen=True)
 class System:
     """Represents a gaming system/console."""
     id: int
@@ -28,6 +29,9 @@ class System:
 class SystemService:
     """Service layer for system operations."""
     
+    # Matches the CHECK constraint on systems.availability
+    _VALID_AVAILABILITY = frozenset({"Available", "In Use"})
+    
     def __init__(self, db: DatabaseConnection):
         """
         Initialize system service.
@@ -36,6 +40,41 @@ class SystemService:
             db: DatabaseConnection instance
         """
         self.db = db
+        # (cache key, all systems ordered by name, id index, id -> name),
+        # reloaded whenever the database may have changed. Kept as one
+        # tuple and replaced in a single assignment so a reader on another
+        # thread never sees parts from different loads.
+        self._cache: Optional[Tuple[Any, List[System], Dict[int, System], Dict[int, str]]] = None
+    
+    def _cached_systems(self) -> Tuple[Any, List[System], Dict[int, System], Dict[int, str]]:
+        """
+        Return the systems cache, reloading it when no longer valid.
+        
+        The systems table is tiny, so one query loads all of it. The cache
+        is keyed on the connection's cache key, so any write (an
+        availability change, an added or renamed system, a restored
+        backup) forces a reload.
+        
+        Returns:
+            Tuple of (cache key, systems ordered by name, id -> System,
+            id -> system name)
+        """
+        cache_key = self.db.cache_key
+        cache = self._cache
+        if cache is None or cache[0] != cache_key:
+            # Columns in System field order, so rows unpack positionally
+            rows = self.db.fetch_all_tuples(
+                "SELECT id, system_name, system_type, default_hourly_rate, availability FROM systems ORDER BY system_name"
+            )
+            systems = [System(*row) for row in rows]
+            cache = (
+                cache_key,
+                systems,
+                {system.id: system for system in systems},
+                {system.id: system.system_name for system in systems},
+            )
+            self._cache = cache
+        return cache
     
     def get_all_systems(self) -> List[System]:
         """
@@ -44,10 +83,18 @@ class SystemService:
         Returns:
             List of System objects
         """
-        rows = self.db.fetch_all(
-            "SELECT id, system_name, system_type, default_hourly_rate, availability FROM systems ORDER BY system_name"
-        )
-        return [self._row_to_system(row) for row in rows]
+        return list(self._cached_systems()[1])
+    
+    def get_name_map(self) -> Dict[int, str]:
+        """
+        Get a system ID to system name mapping for all systems.
+        
+        The returned dictionary is shared with the cache; do not modify it.
+        
+        Returns:
+            Dictionary mapping system ID to system name
+        """
+        return self._cached_systems()[3]
     
     def get_system_by_id(self, system_id: int) -> Optional[System]:
         """
@@ -59,11 +106,7 @@ class SystemService:
         Returns:
             System object or None if not found
         """
-        row = self.db.fetch_one(
-            "SELECT id, system_name, system_type, default_hourly_rate, availability FROM systems WHERE id = ?",
-            (system_id,)
-        )
-        return self._row_to_system(row) if row else None
+        return self._cached_systems()[2].get(system_id)
     
     def get_available_systems(self) -> List[System]:
         """
@@ -72,10 +115,7 @@ class SystemService:
         Returns:
             List of available System objects
         """
-        rows = self.db.fetch_all(
-            "SELECT id, system_name, system_type, default_hourly_rate, availability FROM systems WHERE availability = 'Available' ORDER BY system_name"
-        )
-        return [self._row_to_system(row) for row in rows]
+        return [system for system in self._cached_systems()[1] if system.availability == "Available"]
     
     def get_systems_in_use(self) -> List[System]:
         """
@@ -84,10 +124,7 @@ class SystemService:
         Returns:
             List of System objects that are in use
         """
-        rows = self.db.fetch_all(
-            "SELECT id, system_name, system_type, default_hourly_rate, availability FROM systems WHERE availability = 'In Use' ORDER BY system_name"
-        )
-        return [self._row_to_system(row) for row in rows]
+        return [system for system in self._cached_systems()[1] if system.availability == "In Use"]
     
     def set_system_availability(self, system_id: int, availability: str) -> bool:
         """
@@ -103,7 +140,7 @@ class SystemService:
         Raises:
             ValueError: If availability is not valid
         """
-        if availability not in ("Available", "In Use"):
+        if availability not in self._VALID_AVAILABILITY:
             raise ValueError(f"Invalid availability: {availability}. Must be 'Available' or 'In Use'")
         
         rows_affected = self.db.update(
@@ -124,13 +161,3 @@ class SystemService:
         """
         system = self.get_system_by_id(system_id)
         return system.default_hourly_rate if system else None
-    
-    def _row_to_system(self, row) -> System:
-        """Convert database row to System object."""
-        return System(
-            id=row["id"],
-            system_name=row["system_name"],
-            system_type=row["system_type"],
-            default_hourly_rate=row["default_hourly_rate"],
-            availability=row["availability"],
-        )
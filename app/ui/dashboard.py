@@ -1,13 +1,57 @@
 """Main dashboard component showing systems and active sessions."""
 
+import time
 import tkinter as tk
+from concurrent.futures import Future, ThreadPoolExecutor
 from tkinter import ttk
-from typing import Callable, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 from app.ui.styles import COLORS, FONTS
 from app.services.system_service import SystemService
 from app.services.session_service import SessionService
 from app.db.connection import DatabaseConnection
-from app.utils.time_utils import format_time_12hr
+from app.utils.time_utils import format_duration, format_time_12hr, format_seconds_hms
+
+
+# Session treeview columns as (name, heading, anchor, width, heading anchor),
+# and the one updated on every timer tick
+_SESSION_COLUMN_CONFIG = (
+    ("System", "System", tk.W, 75, tk.W),
+    ("Customer", "Customer", tk.W, 100, tk.W),
+    ("Planned", "Planned Hrs", tk.CENTER, 70, tk.CENTER),
+    ("Remaining", "Time Left", tk.CENTER, 80, tk.CENTER),
+    ("Rate", "Rate/hr", tk.CENTER, 70, tk.CENTER),
+    ("Total", "Total Due", tk.E, 70, tk.CENTER),
+)
+_SESSION_COLUMNS = tuple(column[0] for column in _SESSION_COLUMN_CONFIG)
+_REMAINING_COLUMN = "Remaining"
+
+# (color, text) for a system card's status line by availability; anything
+# other than "In Use" shows as available
+_AVAILABLE_STATUS = (COLORS["status_available"], "● Available")
+_SYSTEM_STATUS = {
+    "In Use": (COLORS["status_in_use"], "● In Use"),
+    "Available": _AVAILABLE_STATUS,
+}
+
+# Widget options shared by every system card
+_CARD_KW = {"bg": COLORS["bg_card"], "relief": tk.RAISED, "bd": 1}
+_CARD_NAME_KW = {"font": FONTS["heading"], "bg": COLORS["bg_card"], "fg": COLORS["text_primary"]}
+_CARD_TYPE_KW = {"font": FONTS["small"], "bg": COLORS["bg_card"], "fg": COLORS["text_secondary"]}
+_CARD_STATUS_KW = {"font": FONTS["body"], "bg": COLORS["bg_card"]}
+_CARD_RATE_KW = {"font": FONTS["small"], "bg": COLORS["bg_card"], "fg": COLORS["text_muted"]}
+
+# Timer interval; updating every 200 ms keeps the countdown display smooth
+_TIMER_INTERVAL_MS = 200
+
+# Runs dashboard queries off the Tk thread, each dashboard on its own
+# read-only connection so the worker never touches the shared connection
+# or its services; results are polled for from the Tk side
+_DB_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dashboard-db")
+_SESSIONS_POLL_MS = 20
+
+# Seconds the timer reuses the active-session list before checking the
+# database again; refresh() always re-reads it
+_SESSIONS_TTL_SEC = 15.0
 
 
 class Dashboard:
@@ -28,11 +72,44 @@ class Dashboard:
         self.system_service = SystemService(db)
         self.session_service = SessionService(db)
         
+        # Read-only connection and services used only on the database
+        # worker, so reads never land inside a transaction open on the
+        # shared connection and the two sets of caches never cross threads
+        self._reader_db = DatabaseConnection(db.db_path, db.pragmas, read_only=True)
+        self._reader_session_service = SessionService(self._reader_db, SystemService(self._reader_db))
+        
         # Timer state
         self.timer_id = None
+        self._timer_stopped = False
+        self._tick_running = False
+        
+        # refresh() coalescing: a refresh is queued for idle time, or
+        # deferred until the window is shown again
+        self._refresh_pending = False
+        self._refresh_dirty = False
         self.flicker_state = {}  # Track flicker on/off state for each session
         self.flicker_toggle = True  # Toggle for flicker effect
         
+        # When the active sessions shown were last fetched (time.monotonic())
+        self._active_sessions_ts = 0.0
+        # (treeview row, epoch time the session's time is up) per active
+        # session, None without a timer; computed once per refresh so
+        # ticks only subtract
+        self._session_rows: List[Tuple[str, Optional[float]]] = []
+        
+        # Treeview row per active session ID (and back), the values last
+        # written to each row, and the "No active sessions" placeholder row
+        # if shown
+        self._session_iids: Dict[int, str] = {}
+        self._iid_to_session_id: Dict[str, int] = {}
+        self._row_values: Dict[str, tuple] = {}
+        self._empty_row: Optional[str] = None
+        
+        # Active-session fetch running on the database worker, and whether
+        # another one was requested while it ran
+        self._sessions_future: Optional[Future] = None
+        self._sessions_refetch = False
+        
         # Create main container
         self.container = ttk.Frame(parent)
         self.container.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
@@ -41,11 +118,17 @@ class Dashboard:
         self._create_header()
         self._create_content()
         
-        # Store references for updates
+        # Store references for updates: each system's card frame, its
+        # labels, and the (system, grid position) it currently shows
         self.system_frames = {}
-        self.refresh()
-        
-        # Start timer for updating elapsed times
+        self.system_labels = {}
+        self.system_card_state = {}
+        self._do_refresh()
+        
+        # Start timer for updating elapsed times. It pauses itself while the
+        # dashboard is not viewable (e.g. minimized) and resumes when the
+        # window is mapped again
+        self.container.winfo_toplevel().bind("<Map>", self._on_map, add="+")
         self._schedule_timer_update()
     
     def _create_header(self):
@@ -87,30 +170,14 @@ class Dashboard:
         self.sessions_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
         
         # Create treeview for sessions
-        columns = ("System", "Customer", "Planned", "Remaining", "Rate", "Total")
-        self.sessions_tree = ttk.Treeview(self.sessions_frame, columns=columns, height=8)
+        self.sessions_tree = ttk.Treeview(self.sessions_frame, columns=_SESSION_COLUMNS, height=8)
         
         # Define column headings
         self.sessions_tree.column("#0", width=0, stretch=tk.NO)
         self.sessions_tree.heading("#0", text="", anchor=tk.W)
-        
-        self.sessions_tree.column("System", anchor=tk.W, width=75)
-        self.sessions_tree.heading("System", text="System", anchor=tk.W)
-        
-        self.sessions_tree.column("Customer", anchor=tk.W, width=100)
-        self.sessions_tree.heading("Customer", text="Customer", anchor=tk.W)
-        
-        self.sessions_tree.column("Planned", anchor=tk.CENTER, width=70)
-        self.sessions_tree.heading("Planned", text="Planned Hrs", anchor=tk.CENTER)
-        
-        self.sessions_tree.column("Remaining", anchor=tk.CENTER, width=80)
-        self.sessions_tree.heading("Remaining", text="Time Left", anchor=tk.CENTER)
-        
-        self.sessions_tree.column("Rate", anchor=tk.CENTER, width=70)
-        self.sessions_tree.heading("Rate", text="Rate/hr", anchor=tk.CENTER)
-        
-        self.sessions_tree.column("Total", anchor=tk.E, width=70)
-        self.sessions_tree.heading("Total", text="Total Due", anchor=tk.CENTER)
+        for name, heading, anchor, width, heading_anchor in _SESSION_COLUMN_CONFIG:
+            self.sessions_tree.column(name, anchor=anchor, width=width)
+            self.sessions_tree.heading(name, text=heading, anchor=heading_anchor)
         
         # Configure tags for row coloring
         self.sessions_tree.tag_configure("alert", background="#FF6B6B", foreground="white")    # Red for time exceeded
@@ -129,20 +196,49 @@ class Dashboard:
         self.sessions_tree.bind("<Button-3>", self._on_session_right_click)
     
     def refresh(self):
+        """
+        Request a dashboard refresh.
+        
+        Refreshes run once the event loop is idle, so several requests in
+        a row (a dialog's on_success, the Refresh button, menu actions)
+        collapse into a single redraw.
+        """
+        if self._refresh_pending:
+            return
+        self._refresh_pending = True
+        self.parent.after_idle(self._run_refresh)
+    
+    def _run_refresh(self):
+        """Run a queued refresh, or defer it while the window is hidden."""
+        self._refresh_pending = False
+        if not self.container.winfo_viewable():
+            # Redrawn by _on_map once the window is visible again
+            self._refresh_dirty = True
+            return
+        self._do_refresh()
+    
+    def _do_refresh(self):
         """Refresh dashboard with latest data."""
-        # Clear existing system frames
-        for widget in self.systems_frame.winfo_children():
-            widget.destroy()
-        self.system_frames.clear()
+        self._refresh_dirty = False
         
         # Fetch systems
         systems = self.system_service.get_all_systems()
         
-        # Create system cards
+        # Drop cards for systems that no longer exist
+        current_ids = {system.id for system in systems}
+        for system_id in [sid for sid in self.system_frames if sid not in current_ids]:
+            self.system_frames.pop(system_id).destroy()
+            del self.system_labels[system_id]
+            del self.system_card_state[system_id]
+        
+        # Update existing cards in place; only new systems get new widgets
         for idx, system in enumerate(systems):
             row = idx // 3
             col = idx % 3
-            self._create_system_card(system, row, col)
+            if system.id in self.system_frames:
+                self._update_system_card(system, row, col)
+            else:
+                self._create_system_card(system, row, col)
         
         # Refresh active sessions
         self._refresh_sessions()
@@ -157,74 +253,128 @@ class Dashboard:
             col: Grid column
         """
         # Determine status color
-        if system.availability == "In Use":
-            status_color = COLORS["status_in_use"]
-            status_text = "● In Use"
-        else:
-            status_color = COLORS["status_available"]
-            status_text = "● Available"
+        status_color, status_text = _SYSTEM_STATUS.get(system.availability, _AVAILABLE_STATUS)
         
         # Create card frame
-        card = tk.Frame(self.systems_frame, bg=COLORS["bg_card"], relief=tk.RAISED, bd=1)
+        card = tk.Frame(self.systems_frame, **_CARD_KW)
         card.grid(row=row, column=col, padx=5, pady=5, sticky="nsew")
         
-        # System name
-        name_label = tk.Label(
-            card,
-            text=system.system_name,
-            font=FONTS["heading"],
-            bg=COLORS["bg_card"],
-            fg=COLORS["text_primary"]
-        )
+        # System name, type, status indicator and rate; only the text (and
+        # the status color) vary per card
+        name_label = tk.Label(card, text=system.system_name, **_CARD_NAME_KW)
         name_label.pack(pady=(10, 5))
         
-        # Type
-        type_label = tk.Label(
-            card,
-            text=system.system_type,
-            font=FONTS["small"],
-            bg=COLORS["bg_card"],
-            fg=COLORS["text_secondary"]
-        )
+        type_label = tk.Label(card, text=system.system_type, **_CARD_TYPE_KW)
         type_label.pack()
         
-        # Status indicator
-        status_label = tk.Label(
-            card,
-            text=status_text,
-            font=FONTS["body"],
-            bg=COLORS["bg_card"],
-            fg=status_color
-        )
+        status_label = tk.Label(card, text=status_text, fg=status_color, **_CARD_STATUS_KW)
         status_label.pack(pady=5)
         
-        # Rate
-        rate_label = tk.Label(
-            card,
-            text=f"{system.default_hourly_rate}/hour",
-            font=FONTS["small"],
-            bg=COLORS["bg_card"],
-            fg=COLORS["text_muted"]
-        )
+        rate_label = tk.Label(card, text=f"{system.default_hourly_rate}/hour", **_CARD_RATE_KW)
         rate_label.pack(pady=(0, 10))
         
         self.system_frames[system.id] = card
+        self.system_labels[system.id] = {
+            "name": name_label,
+            "type": type_label,
+            "status": status_label,
+            "rate": rate_label,
+        }
+        self.system_card_state[system.id] = (system, row, col)
+    
+    def _update_system_card(self, system, row: int, col: int):
+        """
+        Bring an existing system card up to date.
+        
+        Only touches the widgets when the system or its grid position
+        changed since the card was last drawn.
+        
+        Args:
+            system: System object
+            row: Grid row
+            col: Grid column
+        """
+        old_system, old_row, old_col = self.system_card_state[system.id]
+        if (row, col) != (old_row, old_col):
+            self.system_frames[system.id].grid(row=row, column=col)
+        
+        if system != old_system:
+            status_color, status_text = _SYSTEM_STATUS.get(system.availability, _AVAILABLE_STATUS)
+            labels = self.system_labels[system.id]
+            labels["name"].config(text=system.system_name)
+            labels["type"].config(text=system.system_type)
+            labels["status"].config(text=status_text, fg=status_color)
+            labels["rate"].config(text=f"{system.default_hourly_rate}/hour")
+        
+        self.system_card_state[system.id] = (system, row, col)
     
     def _refresh_sessions(self):
-        """Refresh active sessions display."""
-        # Clear treeview
-        for item in self.sessions_tree.get_children():
-            self.sessions_tree.delete(item)
+        """
+        Refresh active sessions display.
+        
+        The query runs on the database worker thread so the window keeps
+        redrawing meanwhile; the rows are updated on the Tk thread once
+        the result arrives.
+        """
+        if self._sessions_future is not None:
+            # A fetch is already in flight; fetch again once it lands so
+            # writes made since it started are picked up
+            self._sessions_refetch = True
+            return
+        self._sessions_future = _DB_EXECUTOR.submit(self._reader_session_service.get_active_sessions)
+        self.parent.after(_SESSIONS_POLL_MS, self._poll_sessions)
+    
+    def _poll_sessions(self):
+        """Apply the in-flight active-session fetch once it has finished."""
+        future = self._sessions_future
+        if not future.done():
+            self.parent.after(_SESSIONS_POLL_MS, self._poll_sessions)
+            return
+        self._sessions_future = None
+        if not self.container.winfo_exists():
+            return  # Dashboard was destroyed meanwhile
+        
+        try:
+            self._apply_sessions(future.result())
+        finally:
+            if self._sessions_refetch:
+                self._sessions_refetch = False
+                self._refresh_sessions()
+    
+    def _apply_sessions(self, sessions):
+        """
+        Show the given active sessions in the treeview.
         
-        # Fetch active sessions
-        sessions = self.session_service.get_active_sessions()
+        Rows are matched to sessions by ID and updated in place: only
+        changed cells are rewritten, and rows are inserted or deleted only
+        for sessions that started or ended.
+        
+        Args:
+            sessions: Active Session objects, in display order
+        """
+        self._active_sessions_ts = time.monotonic()
+        self._session_rows = []
+        
+        # Delete rows of sessions that are no longer active
+        active_ids = {session.id for session in sessions}
+        for session_id in [sid for sid in self._session_iids if sid not in active_ids]:
+            iid = self._session_iids.pop(session_id)
+            del self._iid_to_session_id[iid]
+            self.sessions_tree.delete(iid)
+            del self._row_values[iid]
+            self.flicker_state.pop(iid, None)
         
         if not sessions:
             # Show empty state
-            self.sessions_tree.insert("", "end", values=("", "No active sessions", "", "", ""))
+            if self._empty_row is None:
+                self._empty_row = self.sessions_tree.insert("", "end", values=("", "No active sessions", "", "", ""))
             return
         
-        # Add sessions to treeview with remaining time
+        if self._empty_row is not None:
+            self.sessions_tree.delete(self._empty_row)
+            self._empty_row = None
+        
+        # Add or update one row per session, with remaining time
         for session in sessions:
             # Start/update timer for this session if timer_manager is available
             if self.timer_manager and session.planned_duration_min:
@@ -240,14 +390,12 @@ class Dashboard:
                     )
             
             # Get remaining time for display (if timer available)
+            deadline = self._session_deadline(session)
             remaining_time_str = "N/A"
-            if self.timer_manager and session.planned_duration_min:
-                timer = self.timer_manager.get_timer(session.id)
-                if timer:
-                    remaining_time_str = timer.get_remaining_time_formatted()
+            if deadline is not None:
+                remaining_time_str = format_seconds_hms(max(0, int(deadline - time.time())))
             
             # Format planned duration in XhYm format
-            from app.utils.time_utils import format_duration
             planned_str = format_duration(session.planned_duration_min) if session.planned_duration_min else "N/A"
             
             # Format display values
@@ -255,12 +403,40 @@ class Dashboard:
             customer = session.customer_name
             rate = f"{session.hourly_rate}"
             total = f"{session.total_due:.0f}" if session.total_due else "Calculating..."
+            values = (system_name, customer, planned_str, remaining_time_str, rate, total)
             
-            self.sessions_tree.insert(
-                "",
-                "end",
-                values=(system_name, customer, planned_str, remaining_time_str, rate, total)
-            )
+            iid = self._session_iids.get(session.id)
+            if iid is None:
+                iid = self.sessions_tree.insert("", "end", values=values)
+                self._session_iids[session.id] = iid
+                self._iid_to_session_id[iid] = session.id
+            else:
+                # Rewrite only the cells whose text changed
+                for column, old_value, value in zip(_SESSION_COLUMNS, self._row_values[iid], values):
+                    if value != old_value:
+                        self.sessions_tree.set(iid, column, value)
+            self._row_values[iid] = values
+            self._session_rows.append((iid, deadline))
+        
+        # Put rows in session order (one call, and only when it changed)
+        order = [iid for iid, _ in self._session_rows]
+        if list(self.sessions_tree.get_children()) != order:
+            self.sessions_tree.set_children("", *order)
+    
+    def _session_deadline(self, session) -> Optional[float]:
+        """
+        Get the epoch time at which a session's planned time runs out.
+        
+        Args:
+            session: Session object
+        
+        Returns:
+            Epoch seconds, or None if the session has no timer
+        """
+        if not (self.timer_manager and session.planned_duration_min):
+            return None
+        timer = self.timer_manager.get_timer(session.id)
+        return timer.get_deadline() if timer else None
     
     def _show_start_session(self):
         """Show start session dialog."""
@@ -273,16 +449,10 @@ class Dashboard:
         if not selected:
             return
         
-        # Get the selected session's index
-        item = selected[0]
-        values = self.sessions_tree.item(item)["values"]
-        
-        # Find the session by system and customer name
-        sessions = self.session_service.get_active_sessions()
-        for session in sessions:
-            if session.system_name == values[0] and session.customer_name == values[1]:
-                self._show_end_session_dialog(session.id)
-                break
+        # Look up the selected row's session (None for the placeholder row)
+        session_id = self._iid_to_session_id.get(selected[0])
+        if session_id is not None:
+            self._show_end_session_dialog(session_id)
     
     def _on_session_right_click(self, event):
         """Handle right-click on session to show context menu."""
@@ -290,17 +460,11 @@ class Dashboard:
         if not selected:
             return
         
-        # Get the selected session's index
-        item = selected[0]
-        values = self.sessions_tree.item(item)["values"]
-        
-        # Find the session by system and customer name
-        sessions = self.session_service.get_active_sessions()
-        for session in sessions:
-            if session.system_name == values[0] and session.customer_name == values[1]:
-                # Show context menu
-                self._show_session_context_menu(session.id, event)
-                break
+        # Look up the selected row's session (None for the placeholder row)
+        session_id = self._iid_to_session_id.get(selected[0])
+        if session_id is not None:
+            # Show context menu
+            self._show_session_context_menu(session_id, event)
     
     def _show_session_context_menu(self, session_id: int, event):
         """Show context menu for session actions."""
@@ -332,68 +496,81 @@ class Dashboard:
         
         EndSessionDialog(self.parent, self.db, session_id, on_success=on_end_success)
     
+    def _on_map(self, event):
+        """Catch up on a deferred refresh and resume the timer when the window is shown again."""
+        if self._refresh_dirty and self.container.winfo_viewable():
+            self._do_refresh()
+        if self.timer_id is None and not self._timer_stopped:
+            self._schedule_timer_update()
+    
     def _schedule_timer_update(self):
         """Schedule periodic updates of remaining times for active sessions."""
-        # Update every 200ms for smooth countdown display
-        self._update_remaining_times()
-        
-        # Toggle flicker effect every 1 second (on for 1s, off for 1s = 2 second blink cycle)
-        import time
-        current_time = int(time.time() * 1000)  # milliseconds
-        if current_time % 2000 < 1000:  # 1000ms on, 1000ms off pattern
-            self.flicker_toggle = True
-        else:
-            self.flicker_toggle = False
-        
-        self._apply_flicker()
-        self.timer_id = self.parent.after(200, self._schedule_timer_update)
-    
-    def _update_remaining_times(self):
-        """Update remaining times in the sessions treeview without full refresh."""
-        # Get current items in treeview
-        items = self.sessions_tree.get_children()
-        if not items:
+        if not self.container.winfo_viewable():
+            # Nothing to show; stay paused until _on_map
+            self.timer_id = None
             return
         
-        # Fetch active sessions
-        sessions = self.session_service.get_active_sessions()
-        if not sessions:
+        # Schedule the next tick before doing this one's work so a slow
+        # tick doesn't push the cadence back
+        self.timer_id = self.parent.after(_TIMER_INTERVAL_MS, self._schedule_timer_update)
+        if self._tick_running:
+            # Previous tick still in progress (e.g. it entered a nested
+            # event loop); skip rather than pile up
             return
         
-        # Clear flicker state and update each item's remaining time and apply color coding
+        self._tick_running = True
+        try:
+            self._update_remaining_times()
+            
+            # Toggle flicker effect every 1 second (on for 1s, off for 1s = 2 second blink cycle)
+            current_time = int(time.time() * 1000)  # milliseconds
+            if current_time % 2000 < 1000:  # 1000ms on, 1000ms off pattern
+                self.flicker_toggle = True
+            else:
+                self.flicker_toggle = False
+            
+            self._apply_flicker()
+        finally:
+            self._tick_running = False
+    
+    def _update_remaining_times(self):
+        """Update remaining times in the sessions treeview without full refresh."""
+        # Reuse the sessions behind the current rows; once they are older
+        # than the TTL, re-fetch in the background (picks up sessions
+        # started or ended elsewhere) and carry on with the current rows
+        if time.monotonic() - self._active_sessions_ts >= _SESSIONS_TTL_SEC:
+            self._active_sessions_ts = time.monotonic()
+            self._refresh_sessions()
+        
+        # Rebuild flicker state while updating each item's remaining time;
+        # rows come from the last refresh rather than from the treeview
+        previous_flicker = set(self.flicker_state)
         self.flicker_state.clear()
-        for i, item in enumerate(items):
-            if i < len(sessions):
-                session = sessions[i]
-                try:
-                    # Get remaining time from timer manager
-                    remaining_time_str = "N/A"
-                    remaining_minutes = 0
-                    if self.timer_manager and session.planned_duration_min:
-                        timer = self.timer_manager.get_timer(session.id)
-                        if timer:
-                            remaining_time_str = timer.get_remaining_time_formatted()
-                            remaining_minutes = timer.get_remaining_time()
-                    
-                    # Get current values
-                    values = list(self.sessions_tree.item(item)["values"])
-                    # Update remaining time (column index 3 - after System, Customer, Planned)
-                    values[3] = remaining_time_str
-                    
-                    # Determine tag based on remaining time
-                    tag_type = ""
-                    if remaining_minutes <= 0:
-                        # Time exceeded - red alert
-                        tag_type = "alert"
-                    
-                    # Store flicker state for this item
-                    if tag_type:
-                        self.flicker_state[item] = tag_type
-                    
-                    # Update the row (without tag yet - will be applied by _apply_flicker)
-                    self.sessions_tree.item(item, values=values, tags=())
-                except Exception:
-                    pass  # Skip on error, next full refresh will handle it
+        now = time.time()
+        # Bound once for the loop below
+        tree_set = self.sessions_tree.set
+        format_remaining = format_seconds_hms
+        flicker_state = self.flicker_state
+        for item, deadline in self._session_rows:
+            # Remaining time is plain subtraction from the precomputed deadline
+            remaining_time_str = "N/A"
+            remaining_seconds = 0
+            if deadline is not None:
+                remaining_seconds = max(0, int(deadline - now))
+                remaining_time_str = format_remaining(remaining_seconds)
+            
+            # Write only the changed cell instead of reading the whole row
+            # back from Tk and rewriting it
+            tree_set(item, _REMAINING_COLUMN, remaining_time_str)
+            
+            if remaining_seconds < 60:
+                # Time exceeded (no whole minute left) - red alert, tag
+                # applied by _apply_flicker
+                flicker_state[item] = "alert"
+        
+        # Clear the tag on rows that are no longer flagged
+        for item in previous_flicker.difference(self.flicker_state):
+            self.sessions_tree.item(item, tags=())
     
     def _apply_flicker(self):
         """Apply flicker effect to warning and alert rows."""
@@ -405,7 +582,10 @@ class Dashboard:
                 self.sessions_tree.item(item, tags=())
     
     def stop_timer(self):
-        """Stop the timer when closing the dashboard."""
+        """Stop the timer and close the worker's connection when closing the dashboard."""
+        self._timer_stopped = True
         if self.timer_id:
             self.parent.after_cancel(self.timer_id)
             self.timer_id = None
+        # Queued behind any in-flight fetch, on the thread that uses it
+        _DB_EXECUTOR.submit(self._reader_db.close)
@@ -206,8 +206,9 @@ class SessionHistoryDialog:
             datetime.strptime(start_date, "%Y-%m-%d")
             datetime.strptime(end_date, "%Y-%m-%d")
             
-            # Fetch completed sessions
-            sessions = self.session_service.get_completed_sessions(start_date, end_date)
+            # Stream completed sessions straight into the tree rather than
+            # materializing the whole range first
+            sessions = self.session_service.iter_sessions("COMPLETED", start_date, end_date)
             
             # Clear existing tree
             for item in self.sessions_tree.get_children():
@@ -279,7 +280,8 @@ class SessionHistoryDialog:
         
         try:
             # Collect session IDs from selected rows
-            sessions = self.session_service.get_completed_sessions(
+            sessions = self.session_service.iter_sessions(
+                "COMPLETED",
                 self.start_date_var.get(),
                 self.end_date_var.get()
             )
@@ -5,6 +5,7 @@ import time
 from datetime import datetime
 from typing import Callable, Optional, Dict
 from dataclasses import dataclass
+from app.utils.time_utils import format_seconds_hms, parse_time_24hr_to_datetime
 
 
 @dataclass
@@ -53,12 +54,11 @@ class SessionTimer:
         self.on_time_up = on_time_up
         self.warning_threshold_min = warning_threshold_min
         
-        # Parse login time and create start_time from it
+        # Parse login time once and create start_time from it
         try:
-            from app.utils.time_utils import parse_time_24hr_to_datetime
             self.start_time = parse_time_24hr_to_datetime(login_time_24hr)
-        except:
-            # Fallback: use current time if parsing fails
+        except (TypeError, ValueError):
+            # Fallback: use current time if login time is missing or malformed
             self.start_time = datetime.now()
         
         self.is_running = False
@@ -126,12 +126,11 @@ class SessionTimer:
         elapsed_time = (datetime.now() - self.start_time).total_seconds() / 60
         remaining_min = max(0, self.planned_duration_min - elapsed_time)
         
-        total_remaining_sec = int(remaining_min * 60)
-        hours = total_remaining_sec // 3600
-        remaining_after_hours = total_remaining_sec % 3600
-        minutes = remaining_after_hours // 60
-        seconds = remaining_after_hours % 60
-        return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+        return format_seconds_hms(int(remaining_min * 60))
+    
+    def get_deadline(self) -> float:
+        """Get the epoch time (as from time.time()) at which the session's time is up."""
+        return self.start_time.timestamp() + self.planned_duration_min * 60
 
 
 class SessionTimerManager:
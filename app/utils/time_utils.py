@@ -79,6 +79,21 @@ def format_duration_with_seconds(duration_seconds: int) -> str:
     return " ".join(parts)
 
 
+def format_seconds_hms(total_seconds: int) -> str:
+    """
+    Format a number of seconds as zero-padded HH:MM:SS.
+    
+    Args:
+        total_seconds: Non-negative number of seconds
+    
+    Returns:
+        Formatted string like "01:05:09"
+    """
+    minutes, seconds = divmod(total_seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+
 def calculate_bill(duration_minutes: int, hourly_rate: float, extra_charges: float = 0.0) -> float:
     """
     Calculate total billing amount.
@@ -93,9 +108,8 @@ def calculate_bill(duration_minutes: int, hourly_rate: float, extra_charges: flo
     Returns:
         Total due amount (float), rounded to 2 decimal places
     """
-    hours = duration_minutes / 60
-    base_amount = hourly_rate * hours
-    total = base_amount + extra_charges
+    # Multiply before dividing so there is no rounded intermediate hours value
+    total = hourly_rate * duration_minutes / 60 + extra_charges
     return round(total, 2)
 
 
@@ -0,0 +1,7 @@
+"""Shared helpers for the test scripts."""
+
+
+def check(condition, message):
+    """Print an [OK]/[FAIL] line for one assertion and return the condition."""
+    print(f"   {'[OK]' if condition else '[FAIL]'} {message}")
+    return condition
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test backup deduplication - an unchanged database reuses the newest backup
+instead of writing another copy, unless the backup is given a new description
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add workspace root to path
+WORKSPACE_ROOT = Path(__file__).parent
+sys.path.insert(0, str(WORKSPACE_ROOT))
+
+from app.db.init import initialize_database
+from app.db.path_manager import DatabaseBackupManager, _read_description
+from helpers import check
+
+
+def backup_files(manager):
+    return sorted(manager.backups_dir.glob(f"*{manager.BACKUP_EXTENSION}"))
+
+
+def next_second():
+    """Backup names carry a one-second timestamp; move past the current one."""
+    time.sleep(1.1)
+
+
+def test_backup_dedupe():
+    """Test create_backup deduplication, including after a restore"""
+    print("Testing backup deduplication...")
+    print("-" * 60)
+
+    workdir = Path(tempfile.mkdtemp())
+    db = initialize_database(workdir / "dedupe.db")
+    manager = DatabaseBackupManager(db.db_path)
+    # Keep test backups out of the real backups directory
+    manager.backups_dir = workdir / "backups"
+    manager.backups_dir.mkdir()
+    ok = True
+
+    print("1. Back-to-back backups of an unchanged database...")
+    first = manager.create_backup("first")
+    next_second()
+    ok &= check(manager.create_backup() == first, f"undescribed backup reused {first.name}")
+    next_second()
+    ok &= check(manager.create_backup("first") == first, "same description reused it too")
+    ok &= check(len(backup_files(manager)) == 1, "one backup file on disk")
+
+    print("\n2. New description on an unchanged database...")
+    next_second()
+    labelled = manager.create_backup("before month-end close")
+    ok &= check(labelled != first, f"new backup written: {labelled.name}")
+    ok &= check(
+        _read_description(labelled.with_suffix(manager.METADATA_EXTENSION)) == "before month-end close",
+        "new description recorded"
+    )
+    next_second()
+    ok &= check(manager.create_backup("before month-end close") == labelled, "repeated description reused it")
+    ok &= check(len(backup_files(manager)) == 2, "two backup files on disk")
+
+    print("\n3. Backup after a change...")
+    db.insert(
+        "INSERT INTO systems (system_name, system_type, default_hourly_rate) VALUES (?, ?, ?)",
+        ("TEST-01", "PC Gaming", 100.0)
+    )
+    next_second()
+    changed = manager.create_backup()
+    ok &= check(changed not in (first, labelled), f"new backup written: {changed.name}")
+    ok &= check(len(backup_files(manager)) == 3, "three backup files on disk")
+    next_second()
+    ok &= check(manager.create_backup() == changed, "unchanged again: newest backup reused")
+
+    print("\n4. Backups after restoring an older backup...")
+    next_second()
+    manager.restore_backup(first)
+    # The pre-restore safety backup carries its own description
+    ok &= check(len(backup_files(manager)) == 4, "labelled safety backup written before restore")
+    next_second()
+    restored = manager.create_backup()
+    ok &= check(restored not in (first, labelled, changed), f"restored state backed up as {restored.name}")
+    next_second()
+    again = manager.create_backup()
+    ok &= check(
+        again == restored,
+        "newest backup is chosen by creation time, not the copied database mtime"
+    )
+    ok &= check(len(backup_files(manager)) == 5, "five backup files on disk")
+
+    print("\n" + "=" * 60)
+    print("✓ All backup dedupe tests passed!" if ok else "✗ Some backup dedupe tests failed")
+    print("=" * 60)
+    return ok
+
+
+if __name__ == "__main__":
+    success = test_backup_dedupe()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Test the batch session APIs - create_prepaid_sessions and end_sessions
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add workspace root to path
+WORKSPACE_ROOT = Path(__file__).parent
+sys.path.insert(0, str(WORKSPACE_ROOT))
+
+from app.db.init import initialize_database
+from app.services.session_service import SessionService, SessionError
+from app.services.system_service import SystemService
+from helpers import check
+
+
+def prepaid_item(name, system_id, **overrides):
+    """Keyword arguments for one create_prepaid_session() call."""
+    item = {
+        "date": "2024-02-10",
+        "customer_name": name,
+        "system_id": system_id,
+        "planned_duration_min": 60,
+        "hourly_rate": 120.0,
+        "payment_method": "Cash",
+    }
+    item.update(overrides)
+    return item
+
+
+def availability(system_service):
+    return {system.id: system.availability for system in system_service.get_all_systems()}
+
+
+def _check_create_prepaid_sessions(db, session_service, system_service):
+    """Test batch creation: all-or-nothing validation and no availability changes"""
+    print("1. create_prepaid_sessions...")
+    ok = True
+    before = availability(system_service)
+
+    try:
+        session_service.create_prepaid_sessions([
+            prepaid_item("Alice", 1),
+            prepaid_item("Bob", 2, planned_duration_min=0),
+            prepaid_item("Carol", 3),
+        ])
+        ok &= check(False, "an invalid item should raise SessionError")
+    except SessionError as e:
+        ok &= check(True, f"invalid item rejected: {e}")
+    ok &= check(
+        db.fetch_one("SELECT COUNT(*) FROM sessions")[0] == 0,
+        "nothing inserted when one item is invalid"
+    )
+
+    try:
+        # Passes validation but violates the systems foreign key on insert
+        session_service.create_prepaid_sessions([prepaid_item("Alice", 1), prepaid_item("Dave", 999)])
+        ok &= check(False, "an unknown system should raise SessionError")
+    except SessionError:
+        ok &= check(True, "unknown system rejected by the database")
+    ok &= check(
+        db.fetch_one("SELECT COUNT(*) FROM sessions")[0] == 0,
+        "nothing inserted when one row fails in the database"
+    )
+
+    for bad_item, problem in [
+        ({key: value for key, value in prepaid_item("Erin", 1).items() if key != "hourly_rate"}, "missing key"),
+        (prepaid_item("Erin", 1, discount=10), "unknown key"),
+    ]:
+        try:
+            session_service.create_prepaid_sessions([prepaid_item("Alice", 1), bad_item])
+            ok &= check(False, f"an item with a {problem} should raise SessionError")
+        except SessionError as e:
+            ok &= check(True, f"{problem} rejected: {e}")
+    ok &= check(
+        db.fetch_one("SELECT COUNT(*) FROM sessions")[0] == 0,
+        "nothing inserted when one item has bad keys"
+    )
+
+    ok &= check(session_service.create_prepaid_sessions([]) == 0, "empty batch creates nothing")
+
+    created = session_service.create_prepaid_sessions([
+        prepaid_item("Alice", 1),
+        prepaid_item("Bob", 2, payment_method="Online", extra_charges=30.0),
+        prepaid_item("Carol", 3, planned_duration_min=90),
+    ])
+    ok &= check(created == 3, f"created {created} sessions")
+    planned = {session.customer_name: session for session in session_service.get_planned_sessions()}
+    ok &= check(set(planned) == {"Alice", "Bob", "Carol"}, "all sessions are PLANNED")
+    ok &= check(planned["Bob"].paid_amount == 150.0, f"Bob paid {planned['Bob'].paid_amount}")
+    ok &= check(planned["Carol"].paid_amount == 180.0, f"Carol paid {planned['Carol'].paid_amount}")
+
+    ok &= check(
+        availability(system_service) == before,
+        "system availability left to the caller (unchanged)"
+    )
+    return ok
+
+
+def _check_end_sessions(db, session_service, system_service):
+    """Test batch ending: all-or-nothing validation and skipping non-ACTIVE sessions"""
+    print("\n2. end_sessions...")
+    ok = True
+    ids = {session.customer_name: session.id for session in session_service.get_planned_sessions()}
+    session_service.start_session(ids["Alice"], "10:00:00")
+    session_service.start_session(ids["Bob"], "9:30:00")
+    # Carol stays PLANNED
+    before = availability(system_service)
+
+    try:
+        session_service.end_sessions([
+            {"session_id": ids["Alice"], "logout_time": "11:00:00"},
+            {"session_id": ids["Bob"], "logout_time": "not a time"},
+        ])
+        ok &= check(False, "an invalid item should raise SessionError")
+    except SessionError as e:
+        ok &= check(True, f"invalid item rejected: {e}")
+    ok &= check(
+        len(session_service.get_active_sessions()) == 2,
+        "no session ended when one item is invalid"
+    )
+
+    for bad_item, problem in [
+        ({"session_id": ids["Bob"]}, "missing key"),
+        ({"session_id": ids["Bob"], "logout_time": "11:00:00", "updated_at": "2024-01-01 00:00:00"}, "unknown key"),
+    ]:
+        try:
+            session_service.end_sessions([{"session_id": ids["Alice"], "logout_time": "11:00:00"}, bad_item])
+            ok &= check(False, f"an item with a {problem} should raise SessionError")
+        except SessionError as e:
+            ok &= check(True, f"{problem} rejected: {e}")
+    ok &= check(
+        len(session_service.get_active_sessions()) == 2,
+        "no session ended when one item has bad keys"
+    )
+
+    ended = session_service.end_sessions([
+        {"session_id": ids["Alice"], "logout_time": "11:00:00", "extra_charges": 20.0},
+        {"session_id": ids["Bob"], "logout_time": "9:45:00", "notes": "short"},
+        {"session_id": ids["Carol"], "logout_time": "12:00:00"},
+    ])
+    ok &= check(ended == 2, f"ended {ended} sessions (PLANNED one not counted)")
+
+    alice = session_service.get_session_by_id(ids["Alice"])
+    bob = session_service.get_session_by_id(ids["Bob"])
+    carol = session_service.get_session_by_id(ids["Carol"])
+    ok &= check(
+        alice.session_state == "COMPLETED" and alice.actual_duration_min == 60 and alice.total_due == 140.0,
+        f"Alice completed: {alice.actual_duration_min} min, total {alice.total_due}"
+    )
+    ok &= check(
+        bob.session_state == "COMPLETED" and bob.logout_time == "09:45:00" and bob.actual_duration_min == 15,
+        f"Bob completed: logout {bob.logout_time}, {bob.actual_duration_min} min"
+    )
+    ok &= check(
+        carol.session_state == "PLANNED" and carol.logout_time is None,
+        "PLANNED session skipped"
+    )
+
+    again = session_service.end_sessions([{"session_id": ids["Alice"], "logout_time": "12:00:00"}])
+    alice_again = session_service.get_session_by_id(ids["Alice"])
+    ok &= check(
+        again == 0 and alice_again.logout_time == "11:00:00",
+        "already COMPLETED session skipped"
+    )
+
+    ok &= check(
+        availability(system_service) == before,
+        "system availability left to the caller (unchanged)"
+    )
+    return ok
+
+
+def test_batch_sessions():
+    """Test the batch session APIs"""
+    print("Testing batch session APIs...")
+    print("-" * 60)
+
+    db = initialize_database(Path(tempfile.mkdtemp()) / "batch.db")
+    system_service = SystemService(db)
+    session_service = SessionService(db, system_service)
+
+    ok = _check_create_prepaid_sessions(db, session_service, system_service)
+    ok &= _check_end_sessions(db, session_service, system_service)
+
+    print("\n" + "=" * 60)
+    print("✓ All batch session tests passed!" if ok else "✗ Some batch session tests failed")
+    print("=" * 60)
+    return ok
+
+
+if __name__ == "__main__":
+    success = test_batch_sessions()
+    sys.exit(0 if success else 1)
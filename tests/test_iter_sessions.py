@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test iter_sessions - streamed results must match the list-returning getters
+with and without date bounds
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add workspace root to path
+WORKSPACE_ROOT = Path(__file__).parent
+sys.path.insert(0, str(WORKSPACE_ROOT))
+
+from app.db.init import initialize_database
+from app.services.session_service import SessionService
+from helpers import check
+
+
+def test_iter_sessions():
+    """Test iter_sessions against get_completed_sessions and get_sessions_by_state"""
+    print("Testing iter_sessions...")
+    print("-" * 60)
+
+    db = initialize_database(Path(tempfile.mkdtemp()) / "iter.db")
+    session_service = SessionService(db)
+    ok = True
+
+    # Dates far from today so open bounds have to fall back to the
+    # 0000-01-01 / 9999-12-31 sentinels to include them
+    dates = ["1900-01-01", "2024-05-01", "2024-05-01", "2024-05-02", "2024-05-03", "2999-12-31"]
+    session_service.create_prepaid_sessions([
+        {
+            "date": date,
+            "customer_name": f"Customer {i}",
+            "system_id": i % 6 + 1,
+            "planned_duration_min": 60,
+            "hourly_rate": 100.0,
+            "payment_method": "Cash",
+        }
+        for i, date in enumerate(dates)
+    ])
+    ids = {s.customer_name: s.id for s in session_service.get_planned_sessions()}
+    # Customer 2 stays PLANNED, Customer 4 is left ACTIVE, the rest complete
+    for i in range(len(dates)):
+        if i == 2:
+            continue
+        session_service.start_session(ids[f"Customer {i}"], f"1{i}:00:00")
+        if i != 4:
+            session_service.end_session(ids[f"Customer {i}"], f"1{i}:30:00")
+
+    print("1. COMPLETED without bounds...")
+    streamed = list(session_service.iter_sessions("COMPLETED"))
+    listed = session_service.get_completed_sessions()
+    ok &= check(len(streamed) == len(dates) - 2, f"streamed {len(streamed)} completed sessions")
+    ok &= check(streamed == listed, "matches get_completed_sessions() (same rows, same order)")
+    ok &= check(
+        {"1900-01-01", "2999-12-31"} <= {s.date for s in streamed},
+        "open bounds include far-past and far-future dates"
+    )
+
+    print("\n2. COMPLETED with bounds...")
+    for start_date, end_date in [
+        ("2024-05-01", "2024-05-02"),
+        ("2024-05-02", None),
+        (None, "2024-05-01"),
+        ("2024-05-02", "2024-05-02"),
+        ("2030-01-01", "2030-12-31"),
+    ]:
+        streamed = list(session_service.iter_sessions("COMPLETED", start_date, end_date))
+        listed = session_service.get_completed_sessions(start_date, end_date)
+        ok &= check(
+            streamed == listed,
+            f"{start_date or 'open'} .. {end_date or 'open'}: {len(streamed)} sessions match"
+        )
+
+    print("\n3. Other states...")
+    for state in ("PLANNED", "ACTIVE"):
+        streamed = list(session_service.iter_sessions(state))
+        listed = session_service.get_sessions_by_state(state)
+        ok &= check(
+            streamed == listed and len(streamed) == 1,
+            f"{state}: {len(streamed)} session matches get_sessions_by_state()"
+        )
+
+    try:
+        next(session_service.iter_sessions("BOGUS"))
+        ok &= check(False, "invalid state should raise ValueError")
+    except ValueError:
+        ok &= check(True, "invalid state raised ValueError")
+
+    print("\n" + "=" * 60)
+    print("✓ All iter_sessions tests passed!" if ok else "✗ Some iter_sessions tests failed")
+    print("=" * 60)
+    return ok
+
+
+if __name__ == "__main__":
+    success = test_iter_sessions()
+    sys.exit(0 if success else 1)
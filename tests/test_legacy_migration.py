@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Test migrating a legacy database - a fixture in the pre-prepaid schema
+(duration_minutes, NOT NULL system_id, 'Paid-Cash' style statuses) must
+come out in the current schema with its values fixed up, and later
+startups must skip initialization while user_version is current
+"""
+
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+# Add workspace root to path
+WORKSPACE_ROOT = Path(__file__).parent
+sys.path.insert(0, str(WORKSPACE_ROOT))
+
+import app.db.init as db_init
+from app.db.init import initialize_database, SCHEMA_VERSION
+from app.services.session_service import SessionService
+from helpers import check
+
+LEGACY_SCHEMA = """
+CREATE TABLE systems (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    system_name TEXT NOT NULL UNIQUE,
+    system_type TEXT NOT NULL,
+    default_hourly_rate REAL NOT NULL,
+    availability TEXT DEFAULT 'Available',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE sessions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    date DATE NOT NULL,
+    customer_name TEXT NOT NULL,
+    system_id INTEGER NOT NULL,
+    login_time TIME,
+    logout_time TIME,
+    duration_minutes INTEGER,
+    hourly_rate REAL NOT NULL,
+    extra_charges REAL DEFAULT 0.0,
+    total_due REAL,
+    payment_status TEXT,
+    notes TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (system_id) REFERENCES systems(id)
+);
+
+INSERT INTO systems (system_name, system_type, default_hourly_rate)
+VALUES ('PS-4', 'PlayStation', 200.0), ('PC-01', 'PC Gaming', 300.0);
+
+INSERT INTO sessions
+    (date, customer_name, system_id, login_time, logout_time, duration_minutes,
+     hourly_rate, total_due, payment_status)
+VALUES
+    ('2023-06-01', 'Cash Customer', 1, '10:00:00', '11:30:00', 90, 200.0, 300.0, 'Paid-Cash'),
+    ('2023-06-01', 'Online Customer', 2, '12:00:00', '13:00:00', 60, 300.0, 300.0, 'Paid-Online'),
+    ('2023-06-02', 'Already Paid', 1, '14:00:00', '14:45:00', 45, 200.0, 150.0, 'PAID'),
+    ('2023-06-02', 'Unpaid Booking', 2, NULL, NULL, NULL, 300.0, NULL, 'Pending'),
+    ('2023-06-03', 'Early Bird', 1, '9:05:00', '10:00:00', 55, 200.0, 200.0, 'Paid-Cash');
+"""
+
+
+def create_legacy_database(db_path):
+    """Write the legacy fixture database."""
+    conn = sqlite3.connect(str(db_path))
+    try:
+        conn.executescript(LEGACY_SCHEMA)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _check_legacy_migration(db):
+    """Test that the legacy fixture migrated with its values fixed up"""
+    print("1. Migrating legacy fixture...")
+    ok = True
+
+    columns = {row["name"]: row for row in db.fetch_all("PRAGMA table_info(sessions)")}
+    ok &= check("session_state" in columns and "payment_method" in columns, "prepaid columns added")
+    ok &= check(columns["system_id"]["notnull"] == 0, "system_id is nullable after the rebuild")
+    ok &= check(
+        db.fetch_one("SELECT COUNT(*) FROM sqlite_master WHERE name = 'sessions_old'")[0] == 0,
+        "temporary sessions_old table dropped"
+    )
+    ok &= check(db.get_user_version() == SCHEMA_VERSION, f"user_version set to {SCHEMA_VERSION}")
+
+    sessions = {
+        row["customer_name"]: row
+        for row in db.fetch_all(
+            """SELECT customer_name, session_state, payment_status, payment_method,
+                      paid_amount, total_due, planned_duration_min, actual_duration_min
+               FROM sessions"""
+        )
+    }
+    ok &= check(len(sessions) == 5, "all legacy sessions kept")
+
+    cash = sessions["Cash Customer"]
+    ok &= check(
+        (cash["payment_status"], cash["payment_method"]) == ("PAID", "Cash"),
+        "'Paid-Cash' became PAID / Cash"
+    )
+    ok &= check(
+        (cash["session_state"], cash["paid_amount"], cash["actual_duration_min"]) == ("COMPLETED", 300.0, 90),
+        "completed session keeps its amount and duration"
+    )
+    online = sessions["Online Customer"]
+    ok &= check(
+        (online["payment_status"], online["payment_method"]) == ("PAID", "Online"),
+        "'Paid-Online' became PAID / Online"
+    )
+    ok &= check(sessions["Already Paid"]["payment_status"] == "PAID", "'PAID' left unchanged")
+
+    unpaid = sessions["Unpaid Booking"]
+    ok &= check(
+        (unpaid["session_state"], unpaid["payment_status"]) == ("PLANNED", "Pending"),
+        "unstarted pending session became PLANNED"
+    )
+    ok &= check(
+        unpaid["total_due"] == unpaid["paid_amount"] == 300.0,
+        f"missing total_due filled from paid_amount ({unpaid['total_due']})"
+    )
+    ok &= check(unpaid["planned_duration_min"] == 60, "missing duration defaulted to 60 minutes")
+
+    early = db.fetch_one("SELECT login_time FROM sessions WHERE customer_name = 'Early Bird'")[0]
+    ok &= check(early == "09:05:00", f"unpadded login_time zero-padded ({early})")
+
+    ok &= check(
+        db.fetch_one("SELECT COUNT(*) FROM systems")[0] == 2,
+        "existing systems kept, no defaults added"
+    )
+    ok &= check(
+        db.fetch_one("SELECT total_revenue FROM daily_revenue_cache WHERE date = '2023-06-01'")[0] == 600.0,
+        "revenue cache rebuilt from migrated sessions"
+    )
+    return ok
+
+
+def _check_login_time_normalization():
+    """Test that re-initializing pads login times so end_session bills correctly"""
+    print("\n3. Unpadded login times on an already-migrated database...")
+    ok = True
+    db = initialize_database(Path(tempfile.mkdtemp()) / "padding.db")
+    session_id = db.insert(
+        """INSERT INTO sessions
+           (date, customer_name, system_id, session_state, planned_duration_min,
+            login_time, hourly_rate, paid_amount, total_due, payment_method)
+           VALUES ('2024-04-01', 'Unpadded', 1, 'ACTIVE', 60, '9:45:00', 120.0, 120.0, 120.0, 'Cash')"""
+    )
+    db.set_user_version(SCHEMA_VERSION - 1)
+    initialize_database(db.db_path)
+
+    login_time = db.fetch_one("SELECT login_time FROM sessions WHERE id = ?", (session_id,))[0]
+    ok &= check(login_time == "09:45:00", f"login_time zero-padded ({login_time})")
+    session_service = SessionService(db)
+    session_service.end_session(session_id, "10:45:00")
+    session = session_service.get_session_by_id(session_id)
+    ok &= check(session.actual_duration_min == 60, f"duration computed from it: {session.actual_duration_min} min")
+    return ok
+
+
+def _check_user_version_gating(db):
+    """Test that initialize_database skips work only while user_version is current"""
+    print("\n2. user_version gating...")
+    ok = True
+    migrate_calls = []
+    original_migrate = db_init.migrate_database
+    db_init.migrate_database = lambda db_path: migrate_calls.append(db_path)
+    try:
+        again = initialize_database(db.db_path)
+        ok &= check(again is db, "same shared connection returned")
+        ok &= check(not migrate_calls, "current user_version returns early (no migration run)")
+
+        db.set_user_version(SCHEMA_VERSION - 1)
+        initialize_database(db.db_path)
+        ok &= check(len(migrate_calls) == 1, "older user_version re-runs initialization")
+        ok &= check(db.get_user_version() == SCHEMA_VERSION, "user_version recorded again")
+    finally:
+        db_init.migrate_database = original_migrate
+
+    # An older user_version on a populated database (e.g. a restored
+    # backup) must get the derived schema objects back
+    revenue_before = db.fetch_all_tuples("SELECT * FROM daily_revenue_cache ORDER BY date")
+    db.execute_script(
+        """DROP TABLE daily_revenue_cache;
+           DROP TRIGGER trg_revenue_insert;
+           DROP TRIGGER trg_revenue_delete;
+           DROP TRIGGER trg_revenue_update_old;
+           DROP TRIGGER trg_revenue_update_new;
+           DROP INDEX idx_sessions_active;
+           DROP INDEX idx_sessions_pending;
+           DROP INDEX idx_sessions_state_date_login;"""
+    )
+    db.set_user_version(0)
+    initialize_database(db.db_path)
+    objects = {row[0] for row in db.fetch_all_tuples("SELECT name FROM sqlite_master")}
+    ok &= check(
+        {"idx_sessions_active", "idx_sessions_pending", "idx_sessions_state_date_login"} <= objects,
+        "query indexes recreated"
+    )
+    ok &= check(
+        {"daily_revenue_cache", "trg_revenue_insert", "trg_revenue_delete",
+         "trg_revenue_update_old", "trg_revenue_update_new"} <= objects,
+        "daily_revenue_cache and its triggers recreated"
+    )
+    ok &= check(
+        db.fetch_all_tuples("SELECT * FROM daily_revenue_cache ORDER BY date") == revenue_before,
+        "daily_revenue_cache rebuilt from the existing sessions"
+    )
+    ok &= check(db.get_user_version() == SCHEMA_VERSION, "user_version recorded again")
+    return ok
+
+
+def test_legacy_database():
+    """Test migrating the legacy fixture database"""
+    print("Testing legacy database migration...")
+    print("-" * 60)
+
+    db_path = Path(tempfile.mkdtemp()) / "legacy.db"
+    create_legacy_database(db_path)
+    db = initialize_database(db_path)
+
+    ok = _check_legacy_migration(db)
+    ok &= _check_user_version_gating(db)
+    ok &= _check_login_time_normalization()
+
+    print("\n" + "=" * 60)
+    print("✓ All legacy migration tests passed!" if ok else "✗ Some legacy migration tests failed")
+    print("=" * 60)
+    return ok
+
+
+if __name__ == "__main__":
+    success = test_legacy_database()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test restoring a backup made before the revenue cache existed - the
+restored database must be brought up to the current schema so revenue
+lookups keep working
+"""
+
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+# Add workspace root to path
+WORKSPACE_ROOT = Path(__file__).parent
+sys.path.insert(0, str(WORKSPACE_ROOT))
+
+from app.db.init import initialize_database, SCHEMA_VERSION
+from app.db.path_manager import DatabaseBackupManager
+from app.services.session_service import SessionService
+from helpers import check
+
+SCHEMA_PATH = WORKSPACE_ROOT.parent / "app" / "db" / "schema.sql"
+
+
+def create_old_backup(backup_path):
+    """Write a user_version 0 database: schema.sql only, no revenue cache."""
+    conn = sqlite3.connect(str(backup_path))
+    try:
+        conn.executescript(SCHEMA_PATH.read_text(encoding="utf-8"))
+        conn.executescript(
+            """INSERT INTO systems (system_name, system_type, default_hourly_rate)
+               VALUES ('PS-4', 'PlayStation', 200.0), ('PC-01', 'PC Gaming', 300.0);
+               INSERT INTO sessions
+                   (date, customer_name, system_id, session_state, planned_duration_min,
+                    login_time, logout_time, actual_duration_min, hourly_rate,
+                    paid_amount, total_due, payment_method, payment_status)
+               VALUES
+                   ('2023-09-01', 'Old Cash', 1, 'COMPLETED', 60, '10:00:00', '11:00:00',
+                    60, 200.0, 200.0, 200.0, 'Cash', 'PAID'),
+                   ('2023-09-01', 'Old Active', 2, 'ACTIVE', 60, '12:00:00', NULL,
+                    NULL, 300.0, 300.0, 300.0, 'Online', 'PAID');"""
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def test_restore_backup():
+    """Test that revenue works after restoring a pre-revenue-cache backup"""
+    print("Testing restore of an old backup...")
+    print("-" * 60)
+
+    workdir = Path(tempfile.mkdtemp())
+    db = initialize_database(workdir / "restore.db")
+    session_service = SessionService(db)
+    manager = DatabaseBackupManager(db.db_path)
+    # Keep test backups out of the real backups directory
+    manager.backups_dir = workdir / "backups"
+    manager.backups_dir.mkdir()
+    ok = True
+
+    old_backup = manager.backups_dir / f"{db.db_path.stem}-20230901-120000{manager.BACKUP_EXTENSION}"
+    create_old_backup(old_backup)
+
+    print("1. Restoring a user_version 0 backup...")
+    ok &= check(manager.restore_backup(old_backup), "restore succeeded")
+    ok &= check(db.get_user_version() == SCHEMA_VERSION, f"user_version brought up to {SCHEMA_VERSION}")
+    ok &= check(
+        db.fetch_one("SELECT COUNT(*) FROM sqlite_master WHERE name = 'daily_revenue_cache'")[0] == 1,
+        "daily_revenue_cache recreated"
+    )
+
+    print("\n2. Revenue after restore...")
+    try:
+        revenue = session_service.get_daily_revenue("2023-09-01")
+        ok &= check(revenue["total_revenue"] == 200.0, f"existing revenue rebuilt: {revenue['total_revenue']}")
+    except sqlite3.Error as e:
+        ok &= check(False, f"get_daily_revenue failed: {e}")
+
+    active = session_service.get_active_sessions()
+    ok &= check(len(active) == 1, "restored active session visible")
+    session_service.end_session(active[0].id, "13:00:00")
+    revenue = session_service.get_date_range_revenue("2023-09-01", "2023-09-01")
+    ok &= check(
+        revenue["total_revenue"] == 500.0 and revenue["online_total"] == 300.0,
+        f"session ended after restore reaches the cache: {revenue['total_revenue']}"
+    )
+
+    print("\n" + "=" * 60)
+    print("✓ All restore tests passed!" if ok else "✗ Some restore tests failed")
+    print("=" * 60)
+    return ok
+
+
+if __name__ == "__main__":
+    success = test_restore_backup()
+    sys.exit(0 if success else 1)
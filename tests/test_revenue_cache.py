@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Test daily_revenue_cache - the trigger-maintained per-day totals must
+match a direct aggregate over the sessions table after every kind of write
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add workspace root to path
+WORKSPACE_ROOT = Path(__file__).parent
+sys.path.insert(0, str(WORKSPACE_ROOT))
+
+from app.db.init import initialize_database
+from app.services.session_service import SessionService
+
+# Per-day totals computed straight from sessions, independently of the
+# expressions the triggers are generated from
+DIRECT_AGGREGATE = """
+    SELECT date,
+           SUM(CASE WHEN payment_method = 'Cash' AND payment_status = 'PAID' THEN total_due ELSE 0 END),
+           SUM(CASE WHEN payment_method = 'Online' AND payment_status = 'PAID' THEN total_due ELSE 0 END),
+           SUM(CASE WHEN payment_method = 'Mixed' AND payment_status = 'PAID' THEN total_due ELSE 0 END),
+           SUM(CASE WHEN payment_status = 'Pending' THEN total_due ELSE 0 END),
+           COUNT(*),
+           SUM(CASE WHEN payment_status = 'PAID' THEN total_due ELSE 0 END)
+    FROM sessions
+    WHERE session_state = 'COMPLETED'
+    GROUP BY date
+"""
+
+CACHED_TOTALS = """
+    SELECT date, cash_total, online_total, mixed_total, pending_total,
+           session_count, total_revenue
+    FROM daily_revenue_cache
+    WHERE session_count != 0
+"""
+
+
+def totals_by_date(db, query):
+    """Map date -> rounded totals tuple for one of the queries above."""
+    return {
+        row[0]: tuple(round(value, 2) for value in row[1:])
+        for row in db.fetch_all_tuples(query)
+    }
+
+
+def check_cache(db, step):
+    """Compare the cache against the direct aggregate and report the result."""
+    cached = totals_by_date(db, CACHED_TOTALS)
+    direct = totals_by_date(db, DIRECT_AGGREGATE)
+    if cached == direct:
+        print(f"   [OK] cache matches sessions after {step}")
+        return True
+    print(f"   [FAIL] cache differs after {step}")
+    print(f"          cache:  {cached}")
+    print(f"          direct: {direct}")
+    return False
+
+
+def completed_session(session_service, date, name, system_id, payment_method, logout_time):
+    """Create, start and end one prepaid session; returns its ID."""
+    session_id = session_service.create_prepaid_session(
+        date=date,
+        customer_name=name,
+        system_id=system_id,
+        planned_duration_min=60,
+        hourly_rate=150.0,
+        payment_method=payment_method,
+    )
+    session_service.start_session(session_id, "10:00:00")
+    session_service.end_session(session_id, logout_time, extra_charges=25.0)
+    return session_id
+
+
+def test_revenue_cache():
+    """Test that every write keeps daily_revenue_cache consistent"""
+    print("Testing daily revenue cache triggers...")
+    print("-" * 60)
+
+    db = initialize_database(Path(tempfile.mkdtemp()) / "revenue.db")
+    session_service = SessionService(db)
+    ok = True
+
+    print("1. Insert...")
+    planned_id = session_service.create_prepaid_session(
+        date="2024-03-01", customer_name="Planned", system_id=1,
+        planned_duration_min=30, hourly_rate=100.0, payment_method="Cash"
+    )
+    ok &= check_cache(db, "inserting a PLANNED session")
+    db.insert(
+        """INSERT INTO sessions
+           (date, customer_name, system_id, session_state, planned_duration_min,
+            login_time, logout_time, actual_duration_min, hourly_rate, paid_amount,
+            total_due, payment_method, payment_status)
+           VALUES ('2024-03-01', 'Imported', 2, 'COMPLETED', 60, '09:00:00', '10:00:00',
+                   60, 120.0, 120.0, 120.0, 'Online', 'PAID')"""
+    )
+    ok &= check_cache(db, "inserting a COMPLETED session")
+
+    print("\n2. end_session...")
+    cash_id = completed_session(session_service, "2024-03-01", "Cash", 3, "Cash", "11:15:00")
+    mixed_id = completed_session(session_service, "2024-03-02", "Mixed", 4, "Mixed", "10:45:00")
+    ok &= check_cache(db, "ending sessions on two days")
+
+    print("\n3. Payment status change...")
+    session_service.update_payment_status(cash_id, "Pending")
+    ok &= check_cache(db, "PAID -> Pending")
+    session_service.update_payment_status_bulk([cash_id, mixed_id], "Refunded")
+    ok &= check_cache(db, "bulk change to Refunded")
+    session_service.update_payment_status(mixed_id, "PAID")
+    ok &= check_cache(db, "Refunded -> PAID")
+
+    print("\n4. Date change...")
+    db.update("UPDATE sessions SET date = '2024-03-03' WHERE id = ?", (mixed_id,))
+    ok &= check_cache(db, "moving a completed session to another day")
+    db.update("UPDATE sessions SET date = '2024-03-03' WHERE id = ?", (planned_id,))
+    ok &= check_cache(db, "moving a PLANNED session")
+
+    print("\n5. Delete...")
+    db.delete("DELETE FROM sessions WHERE id = ?", (mixed_id,))
+    ok &= check_cache(db, "deleting a completed session")
+    db.delete("DELETE FROM sessions WHERE id = ?", (planned_id,))
+    ok &= check_cache(db, "deleting a PLANNED session")
+
+    revenue = session_service.get_daily_revenue("2024-03-01")
+    direct = totals_by_date(db, DIRECT_AGGREGATE)["2024-03-01"]
+    if revenue["total_revenue"] == direct[-1]:
+        print(f"   [OK] get_daily_revenue reads the cache: {revenue['total_revenue']}")
+    else:
+        print(f"   [FAIL] get_daily_revenue returned {revenue['total_revenue']}, expected {direct[-1]}")
+        ok = False
+
+    print("\n" + "=" * 60)
+    print("✓ All revenue cache tests passed!" if ok else "✗ Some revenue cache tests failed")
+    print("=" * 60)
+    return ok
+
+
+if __name__ == "__main__":
+    success = test_revenue_cache()
+    sys.exit(0 if success else 1)
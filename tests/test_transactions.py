@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test transaction() and the bulk write helpers - rollback, nesting,
+insert_many/update_many and chunked payment status updates
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add workspace root to path
+WORKSPACE_ROOT = Path(__file__).parent
+sys.path.insert(0, str(WORKSPACE_ROOT))
+
+from app.db.init import initialize_database
+from app.services.session_service import SessionService
+from helpers import check
+
+INSERT_SESSION = """INSERT INTO sessions
+    (date, customer_name, system_id, session_state, planned_duration_min,
+     hourly_rate, paid_amount, total_due, payment_method, payment_status)
+    VALUES (?, ?, 1, 'PLANNED', 60, 100.0, 100.0, 100.0, 'Cash', 'PAID')"""
+
+
+def count_sessions(db):
+    return db.fetch_one("SELECT COUNT(*) FROM sessions")[0]
+
+
+def test_transactions():
+    """Test transaction(), insert_many, update_many and update_payment_status_bulk"""
+    print("Testing transactions and bulk writes...")
+    print("-" * 60)
+
+    db = initialize_database(Path(tempfile.mkdtemp()) / "transactions.db")
+    session_service = SessionService(db)
+    ok = True
+
+    print("1. Rollback on exception...")
+    try:
+        with db.transaction():
+            db.insert(INSERT_SESSION, ("2024-01-15", "Rolled Back"))
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    ok &= check(count_sessions(db) == 0, "insert inside a failed transaction was rolled back")
+    ok &= check(not db.connect().in_transaction, "no transaction left open")
+
+    print("\n2. Nested transaction joins the outer one...")
+    try:
+        with db.transaction():
+            db.insert(INSERT_SESSION, ("2024-01-15", "Outer"))
+            with db.transaction():
+                db.insert(INSERT_SESSION, ("2024-01-15", "Inner"))
+            ok &= check(db.connect().in_transaction, "inner block did not commit the outer transaction")
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    ok &= check(count_sessions(db) == 0, "outer rollback also discarded the inner insert")
+
+    with db.transaction():
+        db.insert(INSERT_SESSION, ("2024-01-15", "Outer"))
+        with db.transaction():
+            db.insert(INSERT_SESSION, ("2024-01-15", "Inner"))
+    ok &= check(count_sessions(db) == 2, "outer commit kept both inserts")
+
+    print("\n3. insert_many / update_many...")
+    inserted = db.insert_many(INSERT_SESSION, [("2024-01-16", f"Bulk {i}") for i in range(1203)])
+    ok &= check(inserted == 1203, f"insert_many inserted {inserted} rows")
+    ok &= check(count_sessions(db) == 1205, "all bulk rows visible")
+
+    updated = db.update_many(
+        "UPDATE sessions SET notes = ? WHERE customer_name = ?",
+        [("first", "Bulk 0"), ("second", "Bulk 1"), ("missing", "Nobody")]
+    )
+    ok &= check(updated == 2, f"update_many reported {updated} affected rows")
+    notes = db.fetch_one("SELECT notes FROM sessions WHERE customer_name = 'Bulk 1'")[0]
+    ok &= check(notes == "second", "update_many applied per-row parameters")
+
+    try:
+        db.insert_many(INSERT_SESSION, [("2024-01-17", "Good"), ("2024-01-17", None)])
+        ok &= check(False, "insert_many with a NOT NULL violation should raise")
+    except Exception:
+        pass
+    ok &= check(
+        db.fetch_one("SELECT COUNT(*) FROM sessions WHERE date = '2024-01-17'")[0] == 0,
+        "failed insert_many wrote nothing"
+    )
+
+    print("\n4. update_payment_status_bulk...")
+    ids = [row[0] for row in db.fetch_all_tuples("SELECT id FROM sessions WHERE date = '2024-01-16'")]
+    ok &= check(len(ids) > 2 * session_service.BULK_CHUNK_SIZE, f"{len(ids)} ids span several chunks")
+    updated = session_service.update_payment_status_bulk(ids, "Pending")
+    ok &= check(updated == len(ids), f"updated {updated} sessions across chunks")
+    pending = db.fetch_one("SELECT COUNT(*) FROM sessions WHERE payment_status = 'Pending'")[0]
+    ok &= check(pending == len(ids), "every chunk was written")
+
+    try:
+        session_service.update_payment_status_bulk(ids, "Bogus")
+        ok &= check(False, "invalid status should raise ValueError")
+    except ValueError:
+        ok &= check(True, "invalid status raised ValueError")
+    pending = db.fetch_one("SELECT COUNT(*) FROM sessions WHERE payment_status = 'Pending'")[0]
+    ok &= check(pending == len(ids), "invalid status changed nothing")
+
+    print("\n" + "=" * 60)
+    print("✓ All transaction tests passed!" if ok else "✗ Some transaction tests failed")
+    print("=" * 60)
+    return ok
+
+
+if __name__ == "__main__":
+    success = test_transactions()
+    sys.exit(0 if success else 1)